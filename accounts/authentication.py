@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import router
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+
+# in User concrete field order, as Model.from_db expects
+SNAPSHOT_FIELDS = ('id', 'username', 'is_active', 'is_admin')
+
+
+class TokenCache:
+    """
+    Bounded, per-process LRU map of token key -> user snapshot whose entries
+    expire after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize, ttl, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.timer():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, snapshot):
+        with self._lock:
+            self._entries[key] = (self.timer() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        with self._lock:
+            for key in [key for key, (_, snapshot) in self._entries.items() if snapshot[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache(maxsize=settings.TOKEN_AUTH_CACHE_SIZE, ttl=settings.TOKEN_AUTH_CACHE_TTL)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication that skips the token/user
+    lookup while the token is in `token_cache`.
+
+    The returned user only has the snapshot fields loaded; any other field is
+    fetched on first access and save() only writes the loaded fields. Deleting
+    a token or saving a user evicts it from this process's cache at once,
+    other processes pick the change up within TOKEN_AUTH_CACHE_TTL seconds.
+    """
+
+    def authenticate_credentials(self, key):
+        snapshot = token_cache.get(key)
+
+        if snapshot is None:
+            user, token = super().authenticate_credentials(key)
+            snapshot = tuple(getattr(user, field) for field in SNAPSHOT_FIELDS)
+            token_cache.set(key, snapshot)
+
+        if not snapshot[SNAPSHOT_FIELDS.index('is_active')]:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        user = User.from_db(router.db_for_read(User), SNAPSHOT_FIELDS, snapshot)
+        return user, Token(key=key, user_id=user.id)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Post, Tags
+from .models import Post, PostEdit, PublishRun, Tags
 
 # Register your models here.
 
@@ -13,3 +13,17 @@ class PostAdmin(admin.ModelAdmin):
 @admin.register(Tags)
 class TagAdmin(admin.ModelAdmin):
     list_display = ["name", "created", "updated"]
+
+
+@admin.register(PublishRun)
+class PublishRunAdmin(admin.ModelAdmin):
+    list_display = ["started", "post_type", "scheduled_only", "backlog", "published", "notified",
+                    "duration_seconds"]
+    list_filter = ["post_type", "scheduled_only"]
+
+
+@admin.register(PostEdit)
+class PostEditAdmin(admin.ModelAdmin):
+    list_display = ["created", "post", "edited_by"]
+    list_select_related = ["post", "edited_by"]
+    raw_id_fields = ["post", "edited_by"]
@@ -0,0 +1,54 @@
+import functools
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .views import PostDetailApiView, PostListApiView
+
+db_connections = importlib.import_module('ginger-edu-backend.db_connections')
+
+_executor = None
+
+
+def get_executor():
+    """
+    Threads the async views run their queries on. Each keeps a database
+    connection, so ASYNC_VIEW_THREADS bounds the connections of a process.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.ASYNC_VIEW_THREADS,
+                                       thread_name_prefix='async-view')
+    return _executor
+
+
+def run_in_worker_thread(view):
+    """
+    Async view running the sync `view` on the worker threads.
+
+    Django 3.2 has no async ORM, and under ASGI it runs every sync view on a
+    single shared thread, one request at a time. The returned view awaits a
+    worker thread instead, which serves the request, renders the response
+    and recycles its connection the way a WSGI thread does.
+    """
+    def handle(request, *args, **kwargs):
+        db_connections.recycle_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            return response.render()
+        finally:
+            close_old_connections()
+
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        return await sync_to_async(handle, thread_sensitive=False,
+                                   executor=get_executor())(request, *args, **kwargs)
+    return async_view
+
+
+# same envelope, filters, pagination and cache as the sync endpoints
+post_list = run_in_worker_thread(PostListApiView.as_view())
+post_detail = run_in_worker_thread(PostDetailApiView.as_view())
@@ -0,0 +1,188 @@
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.http import urlencode
+
+POSTS_VERSION_KEY = 'blog:posts:version'
+POSTS_LAST_DELETE_KEY = 'blog:posts:last_delete'
+POSTS_RECENT_WRITE_KEY = 'blog:posts:recent_write'
+POST_DETAIL_VERSION_KEY = 'blog:post:detail:version:{}'
+POST_LIST_CACHE_STATS_KEYS = {
+    'hits': 'blog:posts:cache:hits',
+    'misses': 'blog:posts:cache:misses',
+}
+
+
+def get_posts_version():
+    version = cache.get(POSTS_VERSION_KEY)
+    if version is None:
+        # seed from the clock so an evicted counter never restarts below a
+        # version that still has pages cached under it
+        cache.add(POSTS_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(POSTS_VERSION_KEY)
+    return version
+
+
+def note_recent_write():
+    if settings.DATABASE_REPLICAS:
+        cache.set(POSTS_RECENT_WRITE_KEY, True, timeout=settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+
+
+def bump_posts_version():
+    """
+    Invalidate every cached post page. Must run once the write is visible to
+    other connections, i.e. after commit.
+    """
+    note_recent_write()
+    try:
+        return cache.incr(POSTS_VERSION_KEY)
+    except ValueError:
+        get_posts_version()
+        return cache.incr(POSTS_VERSION_KEY)
+
+
+def invalidate_post_lists():
+    """
+    Invalidate cached post pages after a write made through the ORM.
+    """
+    # the bump after commit drops pages other connections rebuilt from the
+    # pre-commit rows; bumping right away too keeps callers inside a
+    # transaction that never commits (e.g. TestCase) consistent
+    bump_posts_version()
+    transaction.on_commit(bump_posts_version)
+
+
+def _post_detail_version_key(slug):
+    return POST_DETAIL_VERSION_KEY.format(hashlib.md5(slug.encode()).hexdigest())
+
+
+def get_post_detail_version(slug):
+    key = _post_detail_version_key(slug)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=settings.BLOG_POST_DETAIL_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump_post_detail_versions(slugs):
+    """
+    Invalidate the cached details of the posts `slugs`, in one cache round
+    trip. Versions are random, so one that expired is never handed out again
+    while details cached under it live. Must run after commit.
+    """
+    versions = {_post_detail_version_key(slug): uuid.uuid4().hex for slug in slugs}
+    if versions:
+        note_recent_write()
+        cache.set_many(versions, timeout=settings.BLOG_POST_DETAIL_CACHE_TIMEOUT)
+
+
+def invalidate_post_details(slugs):
+    """
+    Invalidate the cached details of the posts `slugs` after a write made
+    through the ORM, now and again on commit like invalidate_post_lists().
+    """
+    slugs = list(slugs)
+    if slugs:
+        bump_post_detail_versions(slugs)
+        transaction.on_commit(lambda: bump_post_detail_versions(slugs))
+
+
+def record_post_delete():
+    cache.set(POSTS_LAST_DELETE_KEY, timezone.now(), timeout=None)
+
+
+def get_last_post_delete():
+    return cache.get(POSTS_LAST_DELETE_KEY)
+
+
+def _incr_counter(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_post_list_cache_stats():
+    return {name: cache.get(key, 0) for name, key in POST_LIST_CACHE_STATS_KEYS.items()}
+
+
+def post_list_cache_key(prefix, request):
+    """
+    Key a page on the host it links to, every query parameter (filters,
+    search and pagination) and the current posts version.
+    """
+    params = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+    digest = hashlib.md5('{}://{}?{}'.format(
+        request.scheme, request.get_host(), urlencode(params, doseq=True)).encode()).hexdigest()
+    return f'blog:posts:{prefix}:v{get_posts_version()}:{digest}'
+
+
+def post_detail_cache_key(slug, request):
+    """
+    Key a post on its slug, the host its cover links point to and the
+    current version of the slug.
+    """
+    digest = hashlib.md5('{}://{}/{}'.format(request.scheme, request.get_host(), slug).encode()).hexdigest()
+    return f'blog:post:detail:v{get_post_detail_version(slug)}:{digest}'
+
+
+class ResponseCacheMixin:
+    """
+    Stores entries under `cache_key` for `cache_timeout` seconds and reports
+    `cache_status` in an X-Cache header.
+    """
+
+    def cache_store(self, entry):
+        # a replica may not have the last write yet, and what it served
+        # would otherwise stay cached under the new version
+        if settings.DATABASE_REPLICAS and cache.get(POSTS_RECENT_WRITE_KEY):
+            return
+        cache.set(self.cache_key, entry, self.cache_timeout)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'cache_status', None):
+            response['X-Cache'] = self.cache_status
+        return response
+
+
+class PostListCacheMixin(ResponseCacheMixin):
+    """
+    Read-through cache for list pages. A version bump on any post write
+    orphans every previously cached page.
+    """
+    cache_prefix = None
+    cache_timeout = settings.BLOG_POST_LIST_CACHE_TIMEOUT
+
+    def cache_lookup(self):
+        self.cache_key = post_list_cache_key(self.cache_prefix, self.request)
+        entry = cache.get(self.cache_key)
+
+        if entry is None:
+            _incr_counter(POST_LIST_CACHE_STATS_KEYS['misses'])
+            self.cache_status = 'MISS'
+        else:
+            _incr_counter(POST_LIST_CACHE_STATS_KEYS['hits'])
+            self.cache_status = 'HIT'
+        return entry
+
+
+class PostDetailCacheMixin(ResponseCacheMixin):
+    """
+    Read-through cache for single posts. A write to a post gives its slug a
+    new version, orphaning only that post's cached detail.
+    """
+    cache_timeout = settings.BLOG_POST_DETAIL_CACHE_TIMEOUT
+
+    def cache_lookup(self, slug):
+        self.cache_key = post_detail_cache_key(slug, self.request)
+        entry = cache.get(self.cache_key)
+        self.cache_status = 'MISS' if entry is None else 'HIT'
+        return entry
@@ -0,0 +1,90 @@
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import serializers
+
+from .cache import get_last_post_delete
+
+
+def post_etag(updated):
+    """
+    Strong validator of a single post: its `updated` time as the API
+    serializes it, so it can also be taken from a post already read.
+    """
+    if not isinstance(updated, str):
+        updated = serializers.DateTimeField().to_representation(updated)
+    return quote_etag(updated)
+
+
+def if_match(request, etag):
+    """
+    Whether the If-Match header of `request`, when sent, accepts `etag`.
+    Weak validators never match, as the comparison must be strong.
+    """
+    header = request.META.get('HTTP_IF_MATCH')
+    if header is None:
+        return True
+    etags = parse_etags(header)
+    return etags == ['*'] or etag in etags
+
+
+class ConditionalListMixin:
+    """
+    ETag / Last-Modified support for post list views. Offset pages take
+    their validators from one aggregate over the filtered queryset, so a 304
+    is answered without loading or serializing any post and a 200 hands its
+    count to the paginator. Cursor pages skip the COUNT that aggregate
+    needs: the page rows are read first and are their own validators, so a
+    304 still skips serializing them.
+    """
+    list_validators = None
+
+    def get_list_page(self, queryset):
+        """
+        Return the validators of the requested page, and its list rows when
+        they had to be read for them, otherwise None.
+        """
+        if self.use_cursor_pagination():
+            page = self.paginate_queryset(queryset.list_rows())
+            return self.get_page_validators(page), page
+
+        stats = queryset.order_by().aggregate(last_updated=Max('updated'), count=Count('pk'))
+        # the paginator takes this count instead of counting again
+        self.paginator.known_count = stats['count']
+        return self.build_list_validators(stats['last_updated'], stats['count']), None
+
+    def get_page_validators(self, rows):
+        return self.build_list_validators(max((row['updated'] for row in rows), default=None),
+                                          ','.join(str(row['id']) for row in rows))
+
+    def build_list_validators(self, last_updated, contents):
+        last_modified = max(filter(None, [last_updated, get_last_post_delete()]), default=None)
+        request = self.request
+
+        etag = hashlib.md5('{}|{}|{}|{}'.format(
+            request.build_absolute_uri(),
+            last_updated.isoformat() if last_updated else '',
+            contents,
+            last_modified.isoformat() if last_modified else '',
+        ).encode()).hexdigest()
+        return quote_etag(etag), timegm(last_modified.utctimetuple()) if last_modified else None
+
+    def get_not_modified_response(self, etag, last_modified):
+        """
+        Remember the validators for the response headers and return a 304
+        response when the client copy is still current, otherwise None.
+        """
+        self.list_validators = (etag, last_modified)
+        return get_conditional_response(self.request._request, etag=etag, last_modified=last_modified)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.list_validators and response.status_code in (200, 304):
+            etag, last_modified = self.list_validators
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
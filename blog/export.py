@@ -0,0 +1,54 @@
+import csv
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FIELDS = ('title', 'slug', 'summary', 'body', 'status', 'type', 'pub_date', 'publish_at',
+                 'created', 'updated', 'author_email', 'tags')
+EXPORT_COLUMNS = ('title', 'slug', 'summary', 'body', 'status', 'type', 'pub_date', 'publish_at',
+                  'created', 'updated', 'author__email', 'tag_names')
+
+
+def export_chunks(queryset, chunk_size=None):
+    """
+    Yield lists of export rows, one list per `chunk_size` posts, read through
+    a server side cursor in primary key order. The tags come from the
+    tag_names column, so a chunk costs no extra query and memory only ever
+    holds one chunk.
+    """
+    chunk_size = chunk_size or settings.BLOG_EXPORT_CHUNK_SIZE
+    rows = queryset.order_by('pk').values_list(*EXPORT_COLUMNS).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Echo:
+    """
+    File-like object handing back what is written to it, for csv.writer.
+    """
+
+    def write(self, value):
+        return value
+
+
+def ndjson_stream(queryset, chunk_size=None):
+    encoder = DjangoJSONEncoder()
+    for chunk in export_chunks(queryset, chunk_size):
+        yield ''.join(encoder.encode(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in chunk)
+
+
+def csv_stream(queryset, chunk_size=None):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for chunk in export_chunks(queryset, chunk_size):
+        yield ''.join(writer.writerow(row[:-1] + (','.join(row[-1]),)) for row in chunk)
+
+
+EXPORT_FORMATS = {
+    'ndjson': (ndjson_stream, 'application/x-ndjson'),
+    'csv': (csv_stream, 'text/csv'),
+}
@@ -0,0 +1,24 @@
+from django_filters import rest_framework as filters
+
+from .models import Post
+
+
+class PostFilter(filters.FilterSet):
+    """
+    Post list filters. tags__name matches the tag_names array through its
+    GIN index, so no tag join runs and every post is listed once.
+    """
+    tags__name = filters.CharFilter(method='filter_tag_name')
+
+    class Meta:
+        model = Post
+        fields = ('tags__name', 'status', 'type', 'pub_date', )
+
+    def filter_tag_name(self, queryset, name, value):
+        return queryset.filter(tag_names__contains=[value])
+
+
+class PostSearchFilter(PostFilter):
+
+    class Meta(PostFilter.Meta):
+        fields = ('tags__name', 'type', 'pub_date', )
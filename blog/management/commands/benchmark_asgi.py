@@ -0,0 +1,123 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+
+def benchmark_host():
+    # a host the request validation accepts
+    return next((host for host in settings.ALLOWED_HOSTS if host and host != '*' and not host.startswith('.')),
+                'localhost')
+
+
+def summary(name, elapsed, latencies):
+    latencies.sort()
+    return {'mode': name, 'requests_per_second': len(latencies) / elapsed,
+            'mean_ms': statistics.mean(latencies),
+            'p95_ms': latencies[int(len(latencies) * 0.95) - 1]}
+
+
+class Command(BaseCommand):
+    """
+    Drives the real WSGI and ASGI handlers in process, so no server is
+    needed, with clients that take --client-delay ms to read a response:
+
+    - WSGI: a pool of --threads threads, like gunicorn's gthread workers. A
+      thread stays busy until its slow client has read the response.
+    - ASGI: --concurrency clients on one event loop, like uvicorn. Sending to
+      a slow client is awaited without holding a thread, but sync views all
+      run on Django's single thread sensitive thread; the async view runs on
+      the ASYNC_VIEW_THREADS worker threads.
+
+    Against real servers, compare `gunicorn --threads 8` with
+    `uvicorn ginger-edu-backend.asgi:application`, using a load generator
+    such as `wrk -c 500` against /blog/posts and /blog/posts/async.
+    """
+    help = "Requests per second of the published post list under WSGI threads and under ASGI, with slow clients"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=100, help="clients sending requests at once")
+        parser.add_argument('--requests', type=int, default=1000, help="spread evenly over the clients")
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--client-delay', type=float, default=20, help="ms a client takes to read a response")
+
+    def wsgi_request(self, handler, path, host, delay):
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'HTTP_HOST': host}
+        setup_testing_defaults(environ)
+        statuses = []
+        body = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+        try:
+            b''.join(body)
+            time.sleep(delay)
+        finally:
+            body.close()
+        return int(statuses[0].split()[0])
+
+    async def asgi_request(self, handler, path, host, delay):
+        scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                 'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+                 'root_path': '', 'headers': [(b'host', host.encode())],
+                 'client': ('127.0.0.1', 50000), 'server': (host, 80)}
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+            if message['type'] == 'http.response.body' and not message.get('more_body'):
+                await asyncio.sleep(delay)
+
+        await handler(scope, receive, send)
+        return messages[0]['status']
+
+    async def run_clients(self, request, path, options):
+        self.check_status(await request(0), path)
+        delay, latencies = options['client_delay'] / 1000, []
+
+        async def client():
+            for _ in range(options['requests'] // options['concurrency']):
+                started = time.perf_counter()
+                self.check_status(await request(delay), path)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+        return time.perf_counter() - started, latencies
+
+    async def run_wsgi(self, path, options):
+        handler, host, loop = WSGIHandler(), benchmark_host(), asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=options['threads']) as threads:
+            return await self.run_clients(
+                lambda delay: loop.run_in_executor(threads, self.wsgi_request, handler, path, host, delay),
+                path, options)
+
+    async def run_asgi(self, path, options):
+        handler, host = ASGIHandler(), benchmark_host()
+        return await self.run_clients(lambda delay: self.asgi_request(handler, path, host, delay),
+                                      path, options)
+
+    def check_status(self, status, path):
+        if status != 200:
+            raise CommandError(f"GET {path} answered {status}")
+
+    def handle(self, *args, **options):
+        sync_path, async_path = reverse('post_list_published'), reverse('post_list_published_async')
+        runs = (
+            (f"WSGI, {options['threads']} threads", self.run_wsgi, sync_path),
+            ("ASGI, sync view", self.run_asgi, sync_path),
+            ("ASGI, async view", self.run_asgi, async_path),
+        )
+
+        results = []
+        for name, run, path in runs:
+            results.append(summary(name, *asyncio.run(run(path, options))))
+            self.stdout.write(f"{name:<20} {results[-1]['requests_per_second']:8.1f} req/s, "
+                              f"mean {results[-1]['mean_ms']:.1f} ms, p95 {results[-1]['p95_ms']:.1f} ms")
@@ -0,0 +1,215 @@
+import datetime
+import importlib
+import json
+import math
+import platform
+import random
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from accounts.models import User
+from blog.cache import bump_posts_version
+from blog.models import Post
+from blog.notifications import close_worker_connection
+from blog.tasks import publish_scheduled_posts
+
+from .seed_blog import ADMIN_USERNAME, PASSWORD, USER_PREFIX, seed, tag_name, zipf_weights
+
+celery_app = importlib.import_module('ginger-edu-backend.celery').app
+
+SCENARIOS = ('list', 'filtered_list', 'create', 'edit', 'delete', 'auth', 'publish_sweep')
+
+
+@contextmanager
+def local_notifications():
+    """
+    Run delivery tasks eagerly over a fresh connection of the current email
+    backend, so a sweep needs no broker and queues no mail for posts whose
+    publishing is rolled back.
+    """
+    always_eager = celery_app.conf.task_always_eager
+    celery_app.conf.task_always_eager = True
+    close_worker_connection()
+    try:
+        yield
+    finally:
+        close_worker_connection()
+        celery_app.conf.task_always_eager = always_eager
+
+
+def percentile(ordered, fraction):
+    # nearest rank, so even a few runs give p50 <= p95
+    return ordered[max(0, math.ceil(len(ordered) * fraction) - 1)]
+
+
+class Command(BaseCommand):
+    """
+    For each size, grow the seed data (see seed_blog) to that many posts and
+    run every scenario through the full request stack: `--requests` timed
+    runs, then a few more under tracemalloc and query capture for the
+    peak memory and query counts. Every run is rolled back, so the seed data
+    stays as generated and results are comparable between releases; work
+    deferred to on_commit (cover renditions) is left out.
+
+    The list scenarios bump the post list version before each request, so
+    they measure the database path without clearing the rest of a shared
+    cache. The publish sweep makes `--sweep-backlog` drafts due and
+    runs publish_scheduled_posts; its notifications are delivered in-process
+    to the locmem email backend, as the runs are rolled back.
+
+    Run it against a scratch database, it only counts the seed posts:
+
+        DB_NAME=ginger_bench python manage.py migrate
+        DB_NAME=ginger_bench python manage.py benchmark_blog --output results.json
+    """
+    help = "Latency, queries and peak memory of the blog API and publish sweeps at growing sizes, as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+        parser.add_argument('--requests', type=int, default=50)
+        parser.add_argument('--profile-requests', type=int, default=5)
+        parser.add_argument('--sweep-backlog', type=int, default=500)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--tags', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='-', help="file to write the JSON to, - for stdout")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        report = {
+            'seed': options['seed'], 'users': options['users'], 'tags': options['tags'],
+            'requests': options['requests'], 'sweep_backlog': options['sweep_backlog'],
+            'python': platform.python_version(), 'django': django.get_version(),
+            'database': f'{connection.vendor} {connection.pg_version}' if connection.vendor == 'postgresql'
+            else connection.vendor,
+            'results': [],
+        }
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                               EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'), \
+                local_notifications():
+            for size in sorted(options['sizes']):
+                seed(size, options['users'], options['tags'], options['seed'], stdout=self.stderr)
+                self.prepare()
+                for scenario in options['scenarios']:
+                    result = dict(posts=size, scenario=scenario,
+                                  **self.measure(scenario, getattr(self, f'{scenario}_operation')))
+                    report['results'].append(result)
+                    self.stderr.write(f"{size:>8} posts {scenario:<14} p50 {result['p50_ms']:.2f} ms, "
+                                      f"p95 {result['p95_ms']:.2f} ms, {result['queries_per_request']:g} queries, "
+                                      f"peak {result['peak_memory_kb']:.0f} KB")
+
+        output = json.dumps(report, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(output)
+        else:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+
+    def prepare(self):
+        admin = User.objects.get(username=ADMIN_USERNAME)
+        self.client = Client(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user=admin)[0].key}')
+        seed_posts = Post.objects.filter(author__username__startswith=USER_PREFIX)
+        self.first_id = seed_posts.order_by('pk').values_list('pk', flat=True).first()
+        self.last_id = seed_posts.order_by('-pk').values_list('pk', flat=True).first()
+        self.tag_weights = zipf_weights(self.options['tags'])
+
+    def measure(self, scenario, operation):
+        """
+        Run `operation`, which prepares one run and returns the callable to
+        time, in rolled back transactions. A failed request stops the
+        benchmark rather than timing an error response.
+        """
+        timings, queries, peak = [], 0, 0
+        requests, profile_requests = self.options['requests'], self.options['profile_requests']
+
+        for i in range(1 + requests + profile_requests):
+            with transaction.atomic():
+                run = operation()
+                if i == 0:
+                    # warm up
+                    response = run()
+                elif i <= requests:
+                    started = time.perf_counter()
+                    response = run()
+                    timings.append((time.perf_counter() - started) * 1000)
+                else:
+                    with CaptureQueriesContext(connection) as captured:
+                        tracemalloc.start()
+                        try:
+                            response = run()
+                            peak = max(peak, tracemalloc.get_traced_memory()[1])
+                        finally:
+                            tracemalloc.stop()
+                    queries += len(captured)
+                transaction.set_rollback(True)
+            if getattr(response, 'status_code', 200) >= 400:
+                raise CommandError(f"{scenario} failed with {response.status_code}: {response.content[:200]!r}")
+
+        timings.sort()
+        return {'p50_ms': round(percentile(timings, 0.5), 3),
+                'p95_ms': round(percentile(timings, 0.95), 3),
+                'queries_per_request': round(queries / max(profile_requests, 1), 1),
+                'peak_memory_kb': round(peak / 1024, 1)}
+
+    def random_tags(self, count):
+        return sorted({tag_name(i) for i in self.rng.choices(range(self.options['tags']),
+                                                             cum_weights=self.tag_weights, k=count)})
+
+    def random_post(self):
+        return Post.objects.filter(pk__gte=self.rng.randint(self.first_id, self.last_id)).order_by('pk').\
+            values_list('slug', flat=True).first()
+
+    def post_data(self):
+        return {'summary': f'Benchmark summary {self.rng.random()}', 'body': '<p>Benchmark body</p>' * 20,
+                'type': self.rng.choice(("freemium", "premium")),
+                'pub_date': str(datetime.date.today() + datetime.timedelta(days=7)),
+                'tags': self.random_tags(self.rng.randint(1, 3))}
+
+    def list_operation(self):
+        bump_posts_version()
+        url = f"{reverse('post_list_published')}?offset={self.rng.randrange(50) * 5}"
+        return lambda: self.client.get(url)
+
+    def filtered_list_operation(self):
+        bump_posts_version()
+        url = f"{reverse('post_list_published')}?tags__name={self.random_tags(1)[0]}" \
+              f"&type={self.rng.choice(('freemium', 'premium'))}"
+        return lambda: self.client.get(url)
+
+    def create_operation(self):
+        data = dict(self.post_data(), title=f'Benchmark post {self.rng.random()}')
+        return lambda: self.client.post(reverse('post_add'), json.dumps(data), content_type='application/json')
+
+    def edit_operation(self):
+        url, data = reverse('post_edit', args=[self.random_post()]), self.post_data()
+        return lambda: self.client.put(url, json.dumps(data), content_type='application/json')
+
+    def delete_operation(self):
+        url = reverse('post_delete', args=[self.random_post()])
+        return lambda: self.client.delete(url)
+
+    def auth_operation(self):
+        data = {'username': f'{USER_PREFIX}{self.rng.randrange(self.options["users"])}', 'password': PASSWORD}
+        return lambda: Client().post('/api-token-auth', data)
+
+    def publish_sweep_operation(self):
+        start, backlog = self.rng.randint(self.first_id, self.last_id), self.options['sweep_backlog']
+        drafts = Post.valid_to_publish.order_by('pk').values_list('pk', flat=True)
+        due = list(drafts.filter(pk__gte=start)[:backlog])
+        due += list(drafts.filter(pk__lt=start)[:backlog - len(due)])
+        Post.objects.filter(pk__in=due).update(publish_at=timezone.now() - datetime.timedelta(minutes=1))
+        return publish_scheduled_posts
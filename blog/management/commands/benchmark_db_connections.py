@@ -0,0 +1,58 @@
+import importlib
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from blog.models import Post
+
+db_connections = importlib.import_module('ginger-edu-backend.db_connections')
+
+MODES = (
+    ('new connection per request', 0, False),
+    ('persistent', 60, False),
+    ('persistent, health checked', 60, True),
+)
+
+
+class Command(BaseCommand):
+    help = "Per request latency of a small query with and without persistent database connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+
+    def simulate_request(self, health_checks):
+        # the same connection handling a real request goes through
+        request_started.send(sender=self.__class__)
+        if health_checks:
+            db_connections.expire_health_checks()
+        Post.published_objects.exists()
+        request_finished.send(sender=self.__class__)
+
+    def handle(self, *args, **options):
+        settings_dict = connection.settings_dict
+        saved = settings_dict['CONN_MAX_AGE'], settings_dict.get('CONN_HEALTH_CHECKS')
+        results = []
+        try:
+            for name, max_age, health_checks in MODES:
+                settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'] = max_age, health_checks
+                connection.close()
+                self.simulate_request(health_checks)
+
+                timings = []
+                for _ in range(options['requests']):
+                    started = time.perf_counter()
+                    self.simulate_request(health_checks)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                timings.sort()
+                results.append({'mode': name, 'mean_ms': statistics.mean(timings),
+                                'p50_ms': timings[len(timings) // 2],
+                                'p95_ms': timings[int(len(timings) * 0.95) - 1]})
+                self.stdout.write(f"{name:<28} mean {results[-1]['mean_ms']:.3f} ms, "
+                                  f"p50 {results[-1]['p50_ms']:.3f} ms, p95 {results[-1]['p95_ms']:.3f} ms")
+        finally:
+            settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'] = saved
+            connection.close()
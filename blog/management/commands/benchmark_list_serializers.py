@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import User
+from blog.models import Post, Tags
+from blog.serializers import PostListSerializer, post_list_rows
+
+
+def sample_posts(count):
+    """
+    In-memory posts shaped like a for_list() page, tags already prefetched,
+    and the equivalent list_rows() dicts with their tag mapping.
+    """
+    author = User(id=1, email='author@tell-all.com')
+    tags = [Tags(id=i, name=f'tag-{i}') for i in range(3)]
+    posts, rows, tag_names = [], [], {}
+
+    for i in range(count):
+        fields = {'id': i, 'title': f'Post-{i}', 'slug': f'post-{i}', 'summary': f'summarized-{i}',
+                  'cover_picture': f'cover-picture/post-{i}.png', 'cover_renditions': {},
+                  'status': 'published', 'type': 'freemium'}
+        post = Post(author=author, **fields)
+        post._prefetched_objects_cache = {'tags': tags[:i % 3 + 1]}
+        posts.append(post)
+        rows.append(dict(fields, author__email=author.email))
+        tag_names[i] = [tag.name for tag in tags[:i % 3 + 1]]
+    return posts, rows, tag_names
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = "Compare the per row cost of PostListSerializer and the list_rows() fast path"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000])
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        results = []
+        for count in options['rows']:
+            posts, rows, tag_names = sample_posts(count)
+            serializer = best_of(options['repeat'], lambda: PostListSerializer(posts, many=True).data)
+            fast_path = best_of(options['repeat'], lambda: post_list_rows(rows, tag_names))
+            results.append({'rows': count,
+                            'serializer_us_per_row': serializer / count * 1e6,
+                            'fast_path_us_per_row': fast_path / count * 1e6,
+                            'speedup': serializer / fast_path})
+            self.stdout.write(f"{count:>7} rows: serializer {results[-1]['serializer_us_per_row']:.1f} us/row, "
+                              f"fast path {results[-1]['fast_path_us_per_row']:.1f} us/row, "
+                              f"{results[-1]['speedup']:.1f}x")
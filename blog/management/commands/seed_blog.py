@@ -0,0 +1,163 @@
+import datetime
+import itertools
+import random
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.defaultfilters import slugify
+from django.utils import timezone
+
+from accounts.models import User
+from blog.models import Post, Tags
+from blog.search import update_search_vectors
+from blog.tags import adjust_published_counts
+
+USER_PREFIX = 'seed-user-'
+ADMIN_USERNAME = 'seed-admin'
+PASSWORD = 'seed-password'
+BATCH_SIZE = 5000
+
+TOPICS = ('algebra', 'geometry', 'calculus', 'statistics', 'physics', 'chemistry', 'biology', 'history',
+          'geography', 'literature', 'grammar', 'phonics', 'coding', 'economics', 'music', 'art',
+          'exams', 'homeschooling', 'study-tips', 'teaching', 'parenting', 'careers', 'languages',
+          'robotics', 'astronomy')
+WORDS = ('learn', 'student', 'lesson', 'teacher', 'class', 'practice', 'guide', 'simple', 'easy', 'ways',
+         'understand', 'problem', 'solve', 'question', 'answer', 'exam', 'week', 'notes', 'project', 'skill',
+         'build', 'reading', 'writing', 'numbers', 'world', 'science', 'history', 'ideas', 'children', 'parents',
+         'school', 'home', 'method', 'example', 'review', 'plan', 'start', 'better', 'first', 'new', 'the', 'a',
+         'of', 'and', 'to', 'in', 'for', 'with', 'your', 'how', 'why', 'what', 'every', 'most', 'best')
+
+
+def zipf_weights(count, exponent=1.1):
+    """
+    Cumulative weights making the first items by far the most popular, the
+    way a few tags and authors carry most posts.
+    """
+    return list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+def tag_name(index):
+    topic = TOPICS[index % len(TOPICS)]
+    return topic if index < len(TOPICS) else f'{topic}-{index // len(TOPICS)}'
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choices(WORDS, k=words)).capitalize() + '.'
+
+
+def seed_users(count):
+    """
+    Make sure `count` seed users and the seed admin exist, all sharing one
+    password hash. Returns the seed user ids.
+    """
+    existing = User.objects.filter(username__startswith=USER_PREFIX).count()
+    password = make_password(PASSWORD)
+    User.objects.bulk_create([
+        User(username=f'{USER_PREFIX}{i}', email=f'{USER_PREFIX}{i}@tell-all.com', password=password)
+        for i in range(existing, count)
+    ], batch_size=BATCH_SIZE)
+    User.objects.get_or_create(username=ADMIN_USERNAME, defaults={
+        'email': f'{ADMIN_USERNAME}@tell-all.com', 'password': password, 'is_admin': True})
+
+    user_ids = dict(User.objects.filter(username__startswith=USER_PREFIX).values_list('username', 'id'))
+    return [user_ids[f'{USER_PREFIX}{i}'] for i in range(count)]
+
+
+def seed_tags(count):
+    names = [tag_name(i) for i in range(count)]
+    Tags.objects.bulk_create([Tags(name=name) for name in names], ignore_conflicts=True)
+    tag_ids = dict(Tags.objects.filter(name__in=names).values_list('name', 'id'))
+    return [(tag_ids[name], name) for name in names]
+
+
+def generate_posts(rng, start, stop, author_ids, tags):
+    """
+    Unsaved posts number `start` to `stop` with their tags: mostly
+    published, a long tail of body lengths, zero to five tags each.
+    """
+    author_weights = zipf_weights(len(author_ids))
+    tag_weights = zipf_weights(len(tags))
+    today = datetime.date.today()
+    now = timezone.now()
+    posts = []
+
+    for i in range(start, stop):
+        words = sentence(rng, rng.randint(3, 8))[:-1]
+        status = "published" if rng.random() < 0.8 else "draft"
+        publish_at = None
+        if status == "published":
+            pub_date = today - datetime.timedelta(days=rng.randint(1, 3 * 365))
+        elif rng.random() < 0.3:
+            publish_at = now + datetime.timedelta(minutes=rng.randint(60, 30 * 24 * 60))
+            pub_date = timezone.localdate(publish_at)
+        else:
+            pub_date = today + datetime.timedelta(days=rng.randint(1, 60))
+        post_tags = sorted(set(rng.choices(tags, cum_weights=tag_weights,
+                                           k=rng.choices(range(6), weights=(5, 20, 30, 25, 12, 8))[0])),
+                           key=lambda tag: tag[1])
+        paragraphs = max(1, min(40, int(rng.lognormvariate(1.2, 0.8))))
+
+        post = Post(
+            title=f'{words} {i}',
+            slug=f'{slugify(words)[:40]}-{i}',
+            summary=' '.join(sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(1, 2))),
+            body=''.join(f'<p>{" ".join(sentence(rng, rng.randint(6, 18)) for _ in range(4))}</p>'
+                         for _ in range(paragraphs)),
+            cover_picture=f'cover-picture/seed-{i}.png' if rng.random() < 0.9 else None,
+            status=status,
+            type="premium" if rng.random() < 0.3 else "freemium",
+            pub_date=pub_date,
+            publish_at=publish_at,
+            author_id=rng.choices(author_ids, cum_weights=author_weights)[0],
+            tag_names=[name for _, name in post_tags],
+        )
+        posts.append((post, [tag_id for tag_id, _ in post_tags]))
+    return posts
+
+
+def seed(posts, users=100, tags=200, random_seed=0, batch_size=BATCH_SIZE, stdout=None):
+    """
+    Grow the seed data to `posts` posts by `users` users over `tags` tags.
+    Every batch of posts is drawn from its own random generator, so a seed
+    and batch size always yield the same rows however the growth is split
+    up.
+    Returns the number of posts added.
+    """
+    author_ids = seed_users(users)
+    tag_list = seed_tags(tags)
+    existing = Post.objects.filter(author__username__startswith=USER_PREFIX).count()
+
+    for batch_start in range(existing - existing % batch_size, posts, batch_size):
+        rng = random.Random(f'{random_seed}:{batch_start // batch_size}')
+        batch = generate_posts(rng, batch_start, min(batch_start + batch_size, posts), author_ids, tag_list)
+        batch = batch[max(0, existing - batch_start):]
+
+        with transaction.atomic():
+            Post.objects.bulk_create([post for post, _ in batch])
+            Post.tags.through.objects.bulk_create([
+                Post.tags.through(post_id=post.pk, tags_id=tag_id) for post, tag_ids in batch for tag_id in tag_ids
+            ])
+            update_search_vectors(post.pk for post, _ in batch)
+            adjust_published_counts(Counter(tag_id for post, tag_ids in batch if post.status == "published"
+                                            for tag_id in tag_ids))
+        if stdout is not None:
+            stdout.write(f"seeded {min(batch_start + batch_size, posts)}/{posts} posts")
+    return max(0, posts - existing)
+
+
+class Command(BaseCommand):
+    help = "Bulk insert reproducible users, tags and posts to benchmark against"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--tags', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        added = seed(options['posts'], options['users'], options['tags'], options['seed'],
+                     options['batch_size'], self.stdout)
+        self.stdout.write(f"added {added} posts, {options['posts']} seeded in total")
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_alter_post_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', '-created'], name='blog_post_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'type', 'pub_date'], name='blog_post_status_type_pub_idx'),
+        ),
+        # tag filters join blog_post_tags on tags_id and read post_id, so a
+        # (tags_id, post_id) index lets the join run as an index-only scan
+        migrations.RunSQL(
+            sql='CREATE INDEX blog_post_tags_tag_post_idx ON blog_post_tags (tags_id, post_id);',
+            reverse_sql='DROP INDEX blog_post_tags_tag_post_idx;',
+        ),
+    ]
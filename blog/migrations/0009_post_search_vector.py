@@ -0,0 +1,42 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:45
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def populate_search_vector(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Tags = apps.get_model('blog', 'Tags')
+    SearchVector = django.contrib.postgres.search.SearchVector
+
+    tag_names = Subquery(
+        Tags.objects.filter(post=OuterRef('pk')).order_by().values('post').
+        annotate(names=StringAgg('name', delimiter=' ')).values('names')
+    )
+    Post.objects.update(search_vector=SearchVector('title', weight='A', config='english')
+                        + SearchVector(tag_names, weight='B', config='english')
+                        + SearchVector('summary', weight='B', config='english')
+                        + SearchVector('body', weight='D', config='english'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='blog_post_search_vector_idx'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
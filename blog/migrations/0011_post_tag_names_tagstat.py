@@ -0,0 +1,53 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:02
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_tag_names_and_stats(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Tags = apps.get_model('blog', 'Tags')
+    TagStat = apps.get_model('blog', 'TagStat')
+
+    tag_names = Subquery(
+        Tags.objects.filter(post=OuterRef('pk')).order_by().values('post').
+        annotate(names=ArrayAgg('name', ordering='name')).values('names')
+    )
+    Post.objects.update(tag_names=Coalesce(tag_names, Value([]), output_field=django.contrib.postgres.fields.
+                                           ArrayField(models.CharField(max_length=40))))
+
+    counts = Tags.objects.annotate(published=Count('post', filter=Q(post__status='published')))
+    TagStat.objects.bulk_create([TagStat(tag_id=tag.pk, published_count=tag.published) for tag in counts],
+                                batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_publish_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStat',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stat', serialize=False, to='blog.tags')),
+                ('published_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=40), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='blog_post_tag_names_idx'),
+        ),
+        migrations.RunPython(populate_tag_names_and_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_tag_names_tagstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='cover_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
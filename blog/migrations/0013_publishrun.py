@@ -0,0 +1,38 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_cover_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(max_length=32, unique=True)),
+                ('post_type', models.CharField(choices=[('freemium', 'Freemium'), ('premium', 'Premium')], max_length=20)),
+                ('scheduled_only', models.BooleanField(default=False)),
+                ('started', models.DateTimeField()),
+                ('backlog', models.IntegerField()),
+                ('published', models.IntegerField()),
+                ('notified', models.IntegerField()),
+                ('chunks', models.IntegerField()),
+                ('select_seconds', models.FloatField()),
+                ('update_seconds', models.FloatField()),
+                ('notify_seconds', models.FloatField()),
+                ('duration_seconds', models.FloatField()),
+            ],
+            options={
+                'ordering': ['-started'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='publishrun',
+            index=models.Index(fields=['post_type', '-started'], name='blog_run_type_started_idx'),
+        ),
+    ]
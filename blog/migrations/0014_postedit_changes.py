@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:39
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_publishrun'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='postedit',
+            options={'ordering': ['-created', '-id']},
+        ),
+        migrations.AddField(
+            model_name='postedit',
+            name='changes',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True),
+        ),
+        migrations.AlterField(
+            model_name='postedit',
+            name='post',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='blog.post'),
+        ),
+        migrations.AddIndex(
+            model_name='postedit',
+            index=models.Index(fields=['post', '-created', '-id'], name='blog_edit_post_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postedit',
+            index=models.Index(fields=['-created', '-id'], name='blog_edit_created_idx'),
+        ),
+    ]
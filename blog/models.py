@@ -1,3 +1,7 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.template.defaultfilters import slugify
 
@@ -16,17 +20,52 @@ TYPES = (
 )
 
 
-class DraftManager(models.Manager):
+LIST_FIELDS = ('title', 'slug', 'summary', 'cover_picture', 'cover_renditions', 'status', 'type',
+               'created', 'author', 'author__email')
+# id and created are not rendered, the tag lookup and the cursor paginator need them
+LIST_VALUES = ('id', 'title', 'slug', 'summary', 'cover_picture', 'cover_renditions', 'status', 'type',
+               'created', 'updated', 'author__email')
+DETAIL_FIELDS = LIST_FIELDS + ('body', 'pub_date', 'updated')
+
+
+class PostQuerySet(models.QuerySet):
+    def for_list(self):
+        """
+        Load only the columns list serializers read, with the author joined in
+        and the tags fetched in a single extra query for the whole page.
+        """
+        return self.select_related('author').\
+            prefetch_related(models.Prefetch('tags', queryset=Tags.objects.only('id', 'name').order_by('name'))).\
+            only(*LIST_FIELDS)
+
+    def list_rows(self):
+        """
+        The for_list() columns as plain dicts, for serialize_post_rows().
+        """
+        return self.prefetch_related(None).values(*LIST_VALUES)
+
+    def for_detail(self):
+        """
+        for_list() plus the body and dates a single post is shown with.
+        """
+        return self.for_list().only(*DETAIL_FIELDS)
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    pass
+
+
+class DraftManager(PostManager):
     def get_queryset(self):
         return super(DraftManager, self).get_queryset().filter(status="draft")
 
 
-class PublishedManager(models.Manager):
+class PublishedManager(PostManager):
     def get_queryset(self):
         return super(PublishedManager, self).get_queryset().filter(status="published")
 
 
-class ValidToPublishManager(models.Manager):
+class ValidToPublishManager(PostManager):
     def get_queryset(self):
         return super(ValidToPublishManager, self).\
             get_queryset().filter(summary__isnull=False, body__isnull=False,
@@ -54,19 +93,32 @@ class Post(BaseModel):
     summary = models.TextField(null=True, blank=True)
     body = models.TextField(null=True, blank=True)
     cover_picture = models.ImageField(upload_to='cover-picture/', max_length=100, null=True)
+    # resized copies of cover_picture, written by the generate_cover_renditions task
+    cover_renditions = models.JSONField(default=dict, blank=True, editable=False)
     status = models.CharField(choices=STATUS, default="draft", max_length=20)
     type = models.CharField(choices=TYPES, default="freemium", max_length=20)
     pub_date = models.DateField(null=True, blank=True)
+    publish_at = models.DateTimeField(null=True, blank=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blog_posts')
     tags = models.ManyToManyField(Tags, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # copy of the tag names, filtered on without joining the tag tables
+    tag_names = ArrayField(models.CharField(max_length=40), default=list, blank=True, editable=False)
 
-    objects = models.Manager()
+    objects = PostManager()
     draft_objects = DraftManager()
     published_objects = PublishedManager()
     valid_to_publish = ValidToPublishManager()
 
     class Meta:
         ordering = ['-created']
+        indexes = [
+            models.Index(fields=['status', '-created'], name='blog_post_status_created_idx'),
+            models.Index(fields=['status', 'type', 'pub_date'], name='blog_post_status_type_pub_idx'),
+            models.Index(fields=['status', 'publish_at'], name='blog_post_status_publish_idx'),
+            GinIndex(fields=['search_vector'], name='blog_post_search_vector_idx'),
+            GinIndex(fields=['tag_names'], name='blog_post_tag_names_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -76,11 +128,64 @@ class Post(BaseModel):
             self.slug = slugify(self.title)
         return super().save(*args, **kwargs)
 
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using, fields)
+        # the stored status, which the published counts are kept against
+        if fields is None or 'status' in fields:
+            self._loaded_status = self.status
+
     @property
     def author_email_address(self):
         return self.author.email
 
 
+class TagStat(models.Model):
+    # published posts per tag, adjusted as posts are published, tagged and
+    # deleted so tag clouds never aggregate over posts
+    tag = models.OneToOneField(Tags, on_delete=models.CASCADE, primary_key=True, related_name='stat')
+    published_count = models.IntegerField(default=0)
+
+
 class PostEdit(BaseModel):
     edited_by = models.ForeignKey(User, on_delete=models.CASCADE)
-    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    # looked up through blog_edit_post_created_idx, which leads with post
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, db_index=False)
+    # the fields the edit changed, as {field: [old, new]}; null on older edits
+    changes = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        ordering = ['-created', '-id']
+        indexes = [
+            # a post's history and the activity feed, newest first
+            models.Index(fields=['post', '-created', '-id'], name='blog_edit_post_created_idx'),
+            models.Index(fields=['-created', '-id'], name='blog_edit_created_idx'),
+        ]
+
+
+class PublishRun(models.Model):
+    """
+    Summary of one publish_posts() run with posts due, kept to trend the
+    backlog and publishing latency.
+    """
+    run_id = models.CharField(max_length=32, unique=True)
+    post_type = models.CharField(choices=TYPES, max_length=20)
+    scheduled_only = models.BooleanField(default=False)
+    started = models.DateTimeField()
+    # due posts when the run started
+    backlog = models.IntegerField()
+    published = models.IntegerField()
+    notified = models.IntegerField()
+    chunks = models.IntegerField()
+    select_seconds = models.FloatField()
+    update_seconds = models.FloatField()
+    notify_seconds = models.FloatField()
+    duration_seconds = models.FloatField()
+
+    class Meta:
+        ordering = ['-started']
+        indexes = [
+            models.Index(fields=['post_type', '-started'], name='blog_run_type_started_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.post_type} run {self.run_id}'
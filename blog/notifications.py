@@ -0,0 +1,102 @@
+import importlib
+import logging
+from smtplib import SMTPException, SMTPRecipientsRefused
+
+from celery import shared_task
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+logger = logging.getLogger(__name__)
+task_metrics = importlib.import_module('ginger-edu-backend.task_metrics')
+
+# how long a delivered notification blocks a duplicate to the same address
+NOTIFICATION_DEDUP_TIMEOUT = 60 * 60 * 24
+
+_connection = None
+
+
+def get_worker_connection():
+    """
+    Email connection shared by every delivery task of this worker process,
+    opened on first use and kept open between tasks.
+    """
+    global _connection
+    if _connection is None:
+        _connection = get_connection()
+        _connection.open()
+    return _connection
+
+
+@worker_process_shutdown.connect
+def close_worker_connection(**kwargs):
+    global _connection
+    if _connection is not None:
+        try:
+            _connection.close()
+        finally:
+            _connection = None
+
+
+def _dedup_key(dedup_id, recipient):
+    return f'blog:notification:{dedup_id}:{recipient.lower()}'
+
+
+def build_message(recipient, subject, body):
+    message = EmailMultiAlternatives(subject, body, to=[recipient])
+    message.attach_alternative(body, 'text/html')
+    return message
+
+
+def notify_authors(recipients, subject, body, dedup_id):
+    """
+    Queue one message per recipient, fanned out over delivery tasks of at
+    most BLOG_NOTIFICATION_BATCH_SIZE recipients each. A recipient gets at
+    most one message per `dedup_id`.
+    """
+    recipients = sorted({recipient for recipient in recipients if recipient})
+    batch_size = settings.BLOG_NOTIFICATION_BATCH_SIZE
+
+    for start in range(0, len(recipients), batch_size):
+        deliver_notifications.delay(recipients[start:start + batch_size], subject, body, dedup_id)
+    return len(recipients)
+
+
+@shared_task(bind=True, name='deliver_notifications',
+             autoretry_for=(SMTPException, OSError), retry_backoff=True,
+             retry_backoff_max=600, retry_jitter=True, max_retries=5)
+def deliver_notifications(self, recipients, subject, body, dedup_id):
+    """
+    Send one message to each recipient, the whole batch in one send over the
+    worker connection. Addresses already served for `dedup_id` are skipped,
+    so a retry only sends what is still missing.
+    """
+    keys = {recipient: _dedup_key(dedup_id, recipient) for recipient in recipients}
+    served = cache.get_many(keys.values())
+    pending = [build_message(recipient, subject, body) for recipient in recipients if keys[recipient] not in served]
+    sent = 0
+    try:
+        connection = get_worker_connection()
+        while pending:
+            try:
+                sent += connection.send_messages(pending) or 0
+                done, pending = pending, []
+            except SMTPRecipientsRefused as error:
+                # the messages before the refused one went out; a bad address
+                # must not fail, or retry, the rest of the batch
+                refused = next((index for index, message in enumerate(pending)
+                                if set(message.to) & set(error.recipients)), None)
+                if refused is None:
+                    # no way to tell what went out, fail and retry the batch
+                    raise
+                logger.warning('Notification to %s refused', ', '.join(pending[refused].to))
+                sent += refused
+                done, pending = pending[:refused + 1], pending[refused + 1:]
+            cache.set_many({keys[message.to[0]]: True for message in done}, NOTIFICATION_DEDUP_TIMEOUT)
+    except (SMTPException, OSError):
+        # reconnect on retry
+        close_worker_connection()
+        raise
+    task_metrics.record(sent=sent)
+    return sent
@@ -0,0 +1,75 @@
+from rest_framework import status
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+
+class PostLimitOffsetPagination(LimitOffsetPagination):
+    """
+    The default limit/offset pagination, taking `known_count` when the view
+    already counted the queryset (see ConditionalListMixin) instead of
+    running a second COUNT.
+    """
+    known_count = None
+
+    def get_count(self, queryset):
+        if self.known_count is not None:
+            return self.known_count
+        return super().get_count(queryset)
+
+
+class PostCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (-created, -id), matching Post.Meta.ordering.
+    Pages are fetched with a seek on the index instead of an OFFSET scan and
+    no COUNT query is issued.
+    """
+    ordering = ('-created', '-id')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class PostEditCursorPagination(PostCursorPagination):
+    """
+    Keyset pagination over post edits, matching PostEdit.Meta.ordering and
+    its (post, -created, -id) and (-created, -id) indexes.
+    """
+    page_size = 20
+
+
+class PostPaginationMixin:
+    """
+    Lets a list view switch between the default limit/offset pagination and
+    cursor pagination, either per view through `cursor_pagination` or per
+    request with `?pagination=cursor`.
+    """
+    pagination_class = PostLimitOffsetPagination
+    cursor_pagination = False
+    cursor_pagination_class = PostCursorPagination
+    pagination_query_param = 'pagination'
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return bool(self.cursor_pagination
+                    or params.get(self.pagination_query_param) == 'cursor'
+                    or self.cursor_pagination_class.cursor_query_param in params)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
+
+    def get_paginated_envelope(self, message, data):
+        return {
+            "message": message,
+            "count": getattr(self.paginator, 'count', None),
+            "next": self.paginator.get_next_link(),
+            "previous": self.paginator.get_previous_link(),
+            "data": data,
+        }
+
+    def get_paginated_response(self, data, message=''):
+        return Response(self.get_paginated_envelope(message, data), status=status.HTTP_200_OK)
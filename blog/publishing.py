@@ -0,0 +1,121 @@
+import importlib
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import User
+
+from .cache import bump_post_detail_versions, bump_posts_version
+from .models import Post, PublishRun
+from .notifications import notify_authors
+from .tags import adjust_published_counts, count_tag_links
+
+task_metrics = importlib.import_module('ginger-edu-backend.task_metrics')
+
+
+@contextmanager
+def timed(timings, phase):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] += time.perf_counter() - started
+
+
+def get_publishable_posts(post_type, scheduled_only=False):
+    """
+    Draft posts of `post_type` that are due: scheduled posts whose
+    publish_at has passed and, unless `scheduled_only`, unscheduled posts
+    whose pub_date is today.
+    """
+    due = Q(publish_at__lte=timezone.now())
+    if not scheduled_only:
+        due |= Q(publish_at__isnull=True, pub_date=datetime.today().date())
+    return Post.valid_to_publish.filter(due, type=post_type)
+
+
+def publish_chunk(queryset, chunk_size, timings=None):
+    """
+    Publish up to `chunk_size` posts of `queryset` in one transaction and
+    return (published post ids, their author emails). Seconds spent locking
+    the rows and updating them are added to `timings` under select and
+    update.
+
+    Rows locked by another worker are skipped rather than waited on, and the
+    emails are read from exactly the rows this transaction updated.
+    """
+    timings = Counter() if timings is None else timings
+    with transaction.atomic():
+        with timed(timings, 'select'):
+            post_ids = list(queryset.order_by('pk').select_for_update(skip_locked=True).
+                            values_list('pk', flat=True)[:chunk_size])
+        if not post_ids:
+            return [], set()
+
+        with timed(timings, 'update'):
+            Post.objects.filter(pk__in=post_ids).update(status="published", updated=timezone.now())
+            adjust_published_counts(count_tag_links(post_ids))
+            author_emails = set(User.objects.filter(blog_posts__pk__in=post_ids).
+                                values_list('email', flat=True).distinct())
+    return post_ids, author_emails
+
+
+def publish_posts(post_type, chunk_size=None, scheduled_only=False):
+    """
+    Publish every due post of `post_type`, chunk by chunk, queueing
+    one notification per author and run. Memory use is bounded by the chunk
+    size and the number of distinct authors, not by the size of the
+    backlog, and several workers can run this at the same time.
+
+    Runs that found posts due are summarized in a PublishRun, and the
+    running task is sent the phase timings and row counts.
+    """
+    chunk_size = chunk_size or settings.BLOG_PUBLISH_CHUNK_SIZE
+    queryset = get_publishable_posts(post_type, scheduled_only=scheduled_only)
+    run_id = uuid.uuid4().hex
+    started, started_at = time.perf_counter(), timezone.now()
+    timings = Counter()
+    notified = set()
+    published = chunks = 0
+
+    with timed(timings, 'select'):
+        backlog = queryset.count()
+
+    while backlog:
+        post_ids, author_emails = publish_chunk(queryset, chunk_size, timings)
+        if not post_ids:
+            break
+
+        chunks += 1
+        published += len(post_ids)
+        # QuerySet.update() sends no signals, invalidate the cached posts here
+        bump_posts_version()
+        bump_post_detail_versions(Post.objects.filter(pk__in=post_ids).values_list('slug', flat=True))
+
+        author_emails -= notified
+        if author_emails:
+            with timed(timings, 'notify'):
+                notify_authors(
+                    author_emails,
+                    f'Published {post_type} posts',
+                    f'Hello, your pending {post_type} posts have been published',
+                    dedup_id=run_id,
+                )
+            notified |= author_emails
+
+    task_metrics.record(timings, backlog=backlog, published=published, notified=len(notified))
+    if backlog:
+        PublishRun.objects.create(
+            run_id=run_id, post_type=post_type, scheduled_only=scheduled_only, started=started_at,
+            backlog=backlog, published=published, notified=len(notified), chunks=chunks,
+            select_seconds=timings['select'], update_seconds=timings['update'],
+            notify_seconds=timings['notify'], duration_seconds=time.perf_counter() - started,
+        )
+    return {"published": published, "notified": len(notified)}
@@ -0,0 +1,152 @@
+import base64
+import logging
+import posixpath
+import tempfile
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageFilter
+
+from .cache import bump_post_detail_versions, bump_posts_version
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+RENDITION_FORMATS = (('webp', 'WEBP'), ('jpeg', 'JPEG'))
+PLACEHOLDER_WIDTH = 16
+EXIF_ORIENTATION = 0x0112
+EXIF_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def _scaled(size, width):
+    return width, max(1, round(size[1] * width / size[0]))
+
+
+def _flatten(image):
+    # JPEG has no alpha channel, composite transparent covers on white
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def load_reduced(file, width):
+    """
+    Decode `file` no larger than needed for a `width` pixels wide copy,
+    upright, as RGB or RGBA. Only the header is read before the size check,
+    and JPEGs are decoded at a reduced scale, so a large upload never sits
+    in memory at full resolution.
+    """
+    image = Image.open(file)
+    if image.width * image.height > settings.BLOG_COVER_MAX_PIXELS:
+        raise ValueError(f"cover picture is {image.width}x{image.height}, too large to process")
+
+    transpose = EXIF_TRANSPOSE.get(image.getexif().get(EXIF_ORIENTATION))
+    rotated = transpose in (Image.Transpose.TRANSPOSE, Image.Transpose.ROTATE_270,
+                            Image.Transpose.TRANSVERSE, Image.Transpose.ROTATE_90)
+    upright = image.size[::-1] if rotated else image.size
+    target = _scaled(upright, min(width, upright[0]))
+    target = target[::-1] if rotated else target
+
+    image.draft('RGB', target)
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    image.thumbnail(target, Image.Resampling.LANCZOS)
+    return image.transpose(transpose) if transpose is not None else image
+
+
+def save_rendition(image, name, image_format):
+    """
+    Encode `image` and store it under `name`, spooling to disk past
+    FILE_UPLOAD_MAX_MEMORY_SIZE. Returns the stored name and byte size.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE) as buffer:
+        image.save(buffer, image_format, quality=settings.BLOG_COVER_RENDITION_QUALITY)
+        size = buffer.tell()
+        buffer.seek(0)
+        return default_storage.save(name, File(buffer, name=name)), size
+
+
+def placeholder(image):
+    """
+    A tiny blurred JPEG of `image` as a data URI, shown while the real
+    rendition loads.
+    """
+    tiny = image.resize(_scaled(image.size, PLACEHOLDER_WIDTH)).filter(ImageFilter.GaussianBlur(1))
+    buffer = BytesIO()
+    _flatten(tiny).save(buffer, 'JPEG', quality=50)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def render_cover(file, source):
+    """
+    Store the renditions of the cover picture `file` stored as `source` and
+    return their metadata. Widths above the picture's own are not upscaled.
+    """
+    widths = settings.BLOG_COVER_RENDITION_WIDTHS
+    with load_reduced(file, max(widths)) as base:
+        stem = posixpath.splitext(posixpath.basename(source))[0]
+        directory = posixpath.join(posixpath.dirname(source), 'renditions')
+        renditions = {extension: [] for extension, _ in RENDITION_FORMATS}
+
+        for width in sorted({min(width, base.width) for width in widths}):
+            size = _scaled(base.size, width)
+            resized = base.resize(size, Image.Resampling.LANCZOS) if size != base.size else base
+            for extension, image_format in RENDITION_FORMATS:
+                image = _flatten(resized) if image_format == 'JPEG' else resized
+                name, byte_size = save_rendition(
+                    image, posixpath.join(directory, f'{stem}-{width}w.{extension}'), image_format)
+                renditions[extension].append({'name': name, 'width': size[0], 'height': size[1],
+                                              'size': byte_size})
+
+        return {'source': source, 'width': base.width, 'height': base.height,
+                'placeholder': placeholder(base), 'renditions': renditions}
+
+
+def rendition_names(cover_renditions):
+    return [rendition['name'] for renditions in cover_renditions.get('renditions', {}).values()
+            for rendition in renditions]
+
+
+def render_post_cover(post_id):
+    """
+    Generate the renditions of a post's current cover picture and store
+    their metadata on it, removing the files of the previous cover.
+    """
+    post = Post.objects.filter(pk=post_id).only('slug', 'cover_picture', 'cover_renditions').first()
+    if post is None or not post.cover_picture:
+        return None
+
+    source = post.cover_picture.name
+    try:
+        with post.cover_picture.open('rb') as file:
+            cover_renditions = render_cover(file, source)
+    except (OSError, ValueError, Image.DecompressionBombError) as error:
+        logger.warning("Renditions of %s failed: %s", source, error)
+        return None
+
+    # drop the work when the cover was replaced while this one rendered
+    stored = Post.objects.filter(pk=post_id, cover_picture=source).\
+        update(cover_renditions=cover_renditions, updated=timezone.now())
+    if stored:
+        bump_posts_version()
+        bump_post_detail_versions([post.slug])
+        stale = rendition_names(post.cover_renditions)
+    else:
+        stale, cover_renditions = rendition_names(cover_renditions), None
+    for name in stale:
+        default_storage.delete(name)
+    return cover_renditions
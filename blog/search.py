@@ -0,0 +1,43 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, OuterRef, Subquery
+
+from .models import Post, Tags
+
+SEARCH_CONFIG = 'english'
+
+
+def post_search_vector():
+    """
+    Weighted search document for a post: title first, then tag names and
+    summary, then body.
+    """
+    tag_names = Subquery(
+        Tags.objects.filter(post=OuterRef('pk')).order_by().values('post').
+        annotate(names=StringAgg('name', delimiter=' ')).values('names')
+    )
+    return (SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector(tag_names, weight='B', config=SEARCH_CONFIG)
+            + SearchVector('summary', weight='B', config=SEARCH_CONFIG)
+            + SearchVector('body', weight='D', config=SEARCH_CONFIG))
+
+
+def update_search_vectors(post_ids, **fields):
+    """
+    Recompute the stored search vector of the given posts in one UPDATE,
+    setting any extra `fields` in the same statement.
+    """
+    post_ids = list(post_ids)
+    if post_ids:
+        Post.objects.filter(pk__in=post_ids).update(search_vector=post_search_vector(), **fields)
+
+
+def search_posts(queryset, text):
+    """
+    Filter a post queryset to rows matching `text`, best matches first.
+    The match runs against the GIN indexed search_vector column.
+    """
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.filter(search_vector=query).\
+        annotate(rank=SearchRank(F('search_vector'), query)).\
+        order_by('-rank', '-created', '-id')
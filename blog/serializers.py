@@ -1,7 +1,39 @@
 from rest_framework import serializers
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.fields.files import FieldFile
+from django.template.defaultfilters import slugify
+from django.utils import timezone
 
+from collections import Counter, defaultdict
 from datetime import datetime
-from .models import Post, Tags
+from .cache import invalidate_post_details, invalidate_post_lists
+from .models import Post, PostEdit, Tags, TagStat
+from .search import update_search_vectors
+from .tags import adjust_published_counts, count_tag_links
+
+
+def edit_value(value):
+    # files are recorded by name, the PostEdit encoder handles dates and times
+    return (value.name or None) if isinstance(value, FieldFile) else value
+
+
+def validate_publish_at(publish_at):
+    if publish_at is not None and publish_at <= timezone.now():
+        raise serializers.ValidationError("publish at must be a future time")
+    return publish_at
+
+
+def sync_publish_dates(attrs):
+    """
+    Keep pub_date on the day of publish_at. Setting only a pub_date drops a
+    previous publish_at, handing the post back to the daily publish sweep.
+    """
+    if attrs.get('publish_at'):
+        attrs['pub_date'] = timezone.localdate(attrs['publish_at'])
+    elif 'pub_date' in attrs:
+        attrs['publish_at'] = None
+    return attrs
 
 
 class PostCreateSerializer(serializers.ModelSerializer):
@@ -14,7 +46,7 @@ class PostCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = ['title', 'summary', 'body', 'cover_picture', 'type',
-                  'pub_date', 'tags']
+                  'pub_date', 'publish_at', 'tags']
 
     def validate_title(self, title):
         if Post.objects.filter(title=title).exists():
@@ -26,19 +58,103 @@ class PostCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("pub date must be a future date")
         return pub_date
 
+    def validate_publish_at(self, publish_at):
+        return validate_publish_at(publish_at)
+
+    def validate(self, attrs):
+        return sync_publish_dates(attrs)
+
+
+def cover_picture_url(name, request=None):
+    if not name:
+        return None
+    url = Post._meta.get_field('cover_picture').storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def cover_srcset(name, cover_renditions, request=None):
+    """
+    srcset strings of the cover renditions per format, plus the blur
+    placeholder. None until the renditions of cover `name` exist.
+    """
+    if not cover_renditions or cover_renditions.get('source') != name:
+        return None
+
+    srcset = {'placeholder': cover_renditions['placeholder']}
+    for extension, renditions in cover_renditions['renditions'].items():
+        srcset[extension] = ', '.join(f"{cover_picture_url(rendition['name'], request)} {rendition['width']}w"
+                                      for rendition in renditions)
+    return srcset
+
 
 class PostListSerializer(serializers.ModelSerializer):
+    """
+    Reference representation of a listed post. The list endpoints build the
+    same output through serialize_post_rows(), which must stay in step.
+    """
     tags = serializers.SlugRelatedField(
         many=True,
         read_only=True,
         slug_field='name'
     )
+    cover_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
-        fields = ['title', 'slug', 'summary', 'cover_picture', 'author_email_address',
+        fields = ['title', 'slug', 'summary', 'cover_picture', 'cover_srcset', 'author_email_address',
                   'status', 'type', 'tags']
 
+    def get_cover_srcset(self, post):
+        return cover_srcset(post.cover_picture.name, post.cover_renditions, self.context.get('request'))
+
+
+class PostDetailSerializer(PostListSerializer):
+
+    class Meta(PostListSerializer.Meta):
+        fields = PostListSerializer.Meta.fields + ['body', 'pub_date', 'created', 'updated']
+
+
+def post_list_rows(rows, tag_names, request=None):
+    """
+    PostListSerializer output for `rows` from PostQuerySet.list_rows(), built
+    as plain dicts. `tag_names` maps post ids to their tag names.
+    """
+    return [{
+        'title': row['title'],
+        'slug': row['slug'],
+        'summary': row['summary'],
+        'cover_picture': cover_picture_url(row['cover_picture'], request),
+        'cover_srcset': cover_srcset(row['cover_picture'], row['cover_renditions'], request),
+        'author_email_address': row['author__email'],
+        'status': row['status'],
+        'type': row['type'],
+        'tags': tag_names.get(row['id'], []),
+    } for row in rows]
+
+
+def serialize_post_rows(rows, request=None):
+    """
+    Serialize a page of list rows, fetching the tag names of the whole page
+    in one query ordered like the for_list() prefetch.
+    """
+    tag_names = defaultdict(list)
+    post_ids = [row['id'] for row in rows]
+    if post_ids:
+        links = Post.tags.through.objects.filter(post_id__in=post_ids).order_by('tags__name').\
+            values_list('post_id', 'tags__name')
+        for post_id, name in links:
+            tag_names[post_id].append(name)
+    return post_list_rows(rows, tag_names, request)
+
+
+class TagStatSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source='tag.name')
+    count = serializers.IntegerField(source='published_count')
+
+    class Meta:
+        model = TagStat
+        fields = ['name', 'count']
+
 
 class PostEditSerializer(serializers.ModelSerializer):
 
@@ -50,7 +166,7 @@ class PostEditSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Post
-        fields = ['summary', 'body', 'cover_picture', 'type', 'pub_date', 'tags']
+        fields = ['summary', 'body', 'cover_picture', 'type', 'pub_date', 'publish_at', 'tags']
 
     def validate_title(self, title):
         if Post.published_objects.filter(title=title).exists():
@@ -61,3 +177,231 @@ class PostEditSerializer(serializers.ModelSerializer):
         if pub_date <= datetime.today().date():
             raise serializers.ValidationError("pub date must be a future date")
         return pub_date
+
+    def validate_publish_at(self, publish_at):
+        return validate_publish_at(publish_at)
+
+    def validate(self, attrs):
+        return sync_publish_dates(attrs)
+
+    def update(self, instance, validated_data):
+        """
+        Write only the columns whose value changed, plus `updated`, and the
+        tags only when they differ. What changed is left in `changes` as
+        {field: [old, new]}.
+        """
+        tags = validated_data.pop('tags', None)
+        old = {field: getattr(instance, field) for field, value in validated_data.items()
+               if getattr(instance, field) != value}
+        for field in old:
+            setattr(instance, field, validated_data[field])
+        if old:
+            instance.save(update_fields=list(old) + ['updated'])
+        self.changes = {field: [edit_value(value), edit_value(getattr(instance, field))]
+                        for field, value in old.items()}
+
+        tag_names = sorted({tag.name for tag in tags}) if tags is not None else None
+        if tags is not None and tag_names != sorted(instance.tag_names):
+            self.changes['tags'] = [instance.tag_names, tag_names]
+            instance.tags.set(tags)
+            # the tag signals moved tag_names and updated forward
+            instance.refresh_from_db(fields=['tag_names', 'updated'])
+        return instance
+
+
+class PostEditHistorySerializer(serializers.ModelSerializer):
+    edited_by = serializers.EmailField(source='edited_by.email', read_only=True)
+
+    class Meta:
+        model = PostEdit
+        fields = ['id', 'created', 'edited_by', 'changes']
+
+
+class PostEditActivitySerializer(PostEditHistorySerializer):
+    post = serializers.SlugField(source='post.slug', read_only=True)
+
+    class Meta(PostEditHistorySerializer.Meta):
+        fields = PostEditHistorySerializer.Meta.fields + ['post']
+
+
+class BulkPostListSerializer(serializers.ListSerializer):
+    """
+    Validates a batch of posts with one query per concern instead of one per
+    post: tag names are resolved in a single IN query and `validate_rows`
+    hooks in the set-based checks of the concrete bulk serializer.
+    """
+
+    def to_internal_value(self, data):
+        # run here rather than in validate() so errors stay a per-post list
+        attrs = super().to_internal_value(data)
+        errors = [{} for _ in attrs]
+
+        names = {name for item in attrs for name in item.get('tags', [])}
+        tags = {tag.name: tag for tag in Tags.objects.filter(name__in=names)} if names else {}
+        for item, item_errors in zip(attrs, errors):
+            missing = [name for name in item.get('tags', []) if name not in tags]
+            if missing:
+                item_errors['tags'] = [f"Object with name={name} does not exist." for name in missing]
+            elif 'tags' in item:
+                item['tags'] = [tags[name] for name in dict.fromkeys(item['tags'])]
+
+        self.validate_rows(attrs, errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def validate_rows(self, attrs, errors):
+        pass
+
+    def set_tags(self, tags_by_post, published_ids=()):
+        """
+        Replace the tags of the given posts with two statements in total,
+        moving the tag counts of the `published_ids` posts along.
+        """
+        deltas = Counter(tag.id for post_id in published_ids for tag in tags_by_post[post_id])
+        deltas.subtract(count_tag_links(published_ids))
+
+        through = Post.tags.through
+        through.objects.filter(post_id__in=tags_by_post.keys()).delete()
+        through.objects.bulk_create([through(post_id=post_id, tags_id=tag.id)
+                                     for post_id, tags in tags_by_post.items() for tag in tags])
+        adjust_published_counts(deltas)
+
+
+class BulkPostCreateListSerializer(BulkPostListSerializer):
+
+    def validate_rows(self, attrs, errors):
+        titles = [item['title'] for item in attrs]
+        slugs = [slugify(title) for title in titles]
+        taken = Post.objects.filter(Q(title__in=titles) | Q(slug__in=slugs)).values_list('title', 'slug')
+        taken_titles = {title for title, _ in taken}
+        taken_slugs = {slug for _, slug in taken}
+        seen = set()
+
+        for title, slug, item_errors in zip(titles, slugs, errors):
+            if title in taken_titles or slug in taken_slugs or slug in seen:
+                item_errors['title'] = ["post with this title exist"]
+            seen.add(slug)
+
+    def create(self, validated_data):
+        posts = [Post(slug=slugify(item['title']), tag_names=sorted({tag.name for tag in item.get('tags', [])}),
+                      **{field: value for field, value in item.items() if field != 'tags'})
+                 for item in validated_data]
+
+        with transaction.atomic():
+            Post.objects.bulk_create(posts, batch_size=1000)
+            self.set_tags({post.id: item['tags'] for post, item in zip(posts, validated_data) if item.get('tags')})
+            update_search_vectors([post.id for post in posts])
+
+        invalidate_post_lists()
+        return posts
+
+
+class BulkPostCreateSerializer(serializers.ModelSerializer):
+    tags = serializers.ListField(child=serializers.CharField(max_length=40), required=False,
+                                 write_only=True)
+
+    class Meta:
+        model = Post
+        list_serializer_class = BulkPostCreateListSerializer
+        fields = ['title', 'slug', 'summary', 'body', 'type', 'pub_date', 'publish_at', 'tags']
+        read_only_fields = ['slug']
+        # title uniqueness is checked for the whole batch at once
+        extra_kwargs = {'title': {'validators': []}}
+
+    def validate_pub_date(self, pub_date):
+        if pub_date is not None and pub_date <= datetime.today().date():
+            raise serializers.ValidationError("pub date must be a future date")
+        return pub_date
+
+    def validate_publish_at(self, publish_at):
+        return validate_publish_at(publish_at)
+
+    def validate(self, attrs):
+        return sync_publish_dates(attrs)
+
+
+class BulkPostEditListSerializer(BulkPostListSerializer):
+
+    def validate_rows(self, attrs, errors):
+        slugs = [item['slug'] for item in attrs]
+        posts = Post.objects.in_bulk(slugs, field_name='slug')
+        seen = set()
+
+        for item, item_errors in zip(attrs, errors):
+            if item['slug'] not in posts:
+                item_errors['slug'] = ["post not found"]
+            elif item['slug'] in seen:
+                item_errors['slug'] = ["post is listed more than once"]
+            else:
+                item['post'] = posts[item['slug']]
+            seen.add(item['slug'])
+
+    def create(self, validated_data):
+        """
+        Like single edits, write only the posts and columns whose value
+        changed: a post sent back unchanged keeps its `updated`, validators
+        and cached pages, and leaves no edit behind.
+        """
+        edited_by = validated_data[0]['edited_by'] if validated_data else None
+        now = timezone.now()
+        posts, changed, fields, tags_by_post = [], [], {'updated'}, {}
+
+        changes = {}
+        for item in validated_data:
+            post = item['post']
+            changes[post.id] = {}
+            for field, value in item.items():
+                if field not in ('slug', 'post', 'tags', 'edited_by') and getattr(post, field) != value:
+                    changes[post.id][field] = [edit_value(getattr(post, field)), edit_value(value)]
+                    setattr(post, field, value)
+                    fields.add(field)
+            if 'tags' in item:
+                tag_names = sorted({tag.name for tag in item['tags']})
+                if tag_names != sorted(post.tag_names):
+                    changes[post.id]['tags'] = [post.tag_names, tag_names]
+                    tags_by_post[post.id] = item['tags']
+                    post.tag_names = tag_names
+                    fields.add('tag_names')
+            if changes[post.id]:
+                post.updated = now
+                changed.append(post)
+            posts.append(post)
+
+        if not changed:
+            return posts
+
+        with transaction.atomic():
+            Post.objects.bulk_update(changed, sorted(fields), batch_size=1000)
+            self.set_tags(tags_by_post, [post.id for post in changed
+                                         if post.id in tags_by_post and post.status == "published"])
+            PostEdit.objects.bulk_create([PostEdit(edited_by=edited_by, post=post, changes=changes[post.id])
+                                          for post in changed], batch_size=1000)
+            update_search_vectors([post.id for post in changed])
+
+        invalidate_post_lists()
+        invalidate_post_details([post.slug for post in changed])
+        return posts
+
+
+class BulkPostEditSerializer(serializers.ModelSerializer):
+    slug = serializers.SlugField()
+    tags = serializers.ListField(child=serializers.CharField(max_length=40), required=False,
+                                 write_only=True)
+
+    class Meta:
+        model = Post
+        list_serializer_class = BulkPostEditListSerializer
+        fields = ['slug', 'summary', 'body', 'type', 'pub_date', 'publish_at', 'tags']
+
+    def validate_pub_date(self, pub_date):
+        if pub_date is not None and pub_date <= datetime.today().date():
+            raise serializers.ValidationError("pub date must be a future date")
+        return pub_date
+
+    def validate_publish_at(self, publish_at):
+        return validate_publish_at(publish_at)
+
+    def validate(self, attrs):
+        return sync_publish_dates(attrs)
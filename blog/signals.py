@@ -0,0 +1,153 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_post_details, invalidate_post_lists, record_post_delete
+from .models import Post, Tags
+from .search import update_search_vectors
+from .tasks import generate_cover_renditions
+from .tags import adjust_published_counts, post_tag_names
+
+SEARCHABLE_FIELDS = {'title', 'summary', 'body'}
+
+
+@receiver(post_save, sender=Post)
+def refresh_post_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not SEARCHABLE_FIELDS.intersection(update_fields):
+        return
+    update_search_vectors([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def queue_cover_renditions(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'cover_picture' not in update_fields:
+        return
+    if {'cover_picture', 'cover_renditions'} & instance.get_deferred_fields():
+        return
+    source = instance.cover_picture.name
+    if source and source != instance.cover_renditions.get('source'):
+        # the worker must see the new cover, so queue once it is committed
+        transaction.on_commit(lambda: generate_cover_renditions.delay(instance.pk))
+
+
+def refresh_tagged_posts(post_ids):
+    # tags are part of the serialized post, so a tag change also moves
+    # `updated` forward for the conditional GET validators
+    update_search_vectors(post_ids, updated=timezone.now(), tag_names=post_tag_names())
+    invalidate_post_details(Post.objects.filter(pk__in=post_ids).values_list('slug', flat=True))
+
+
+@receiver(post_save, sender=Tags)
+def refresh_posts_on_tag_rename(sender, instance, created, **kwargs):
+    if not created:
+        refresh_tagged_posts(instance.post_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Tags)
+def collect_posts_on_tag_delete(sender, instance, **kwargs):
+    # the cascade removes the links without sending m2m_changed
+    instance._tagged_post_ids = list(instance.post_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tags)
+def refresh_posts_on_tag_delete(sender, instance, **kwargs):
+    refresh_tagged_posts(getattr(instance, '_tagged_post_ids', []))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_posts_on_tag_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            refresh_tagged_posts([instance.pk])
+    elif action == 'pre_clear':
+        # the affected posts are only known before a reverse clear runs
+        instance._cleared_post_ids = list(instance.post_set.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        refresh_tagged_posts(getattr(instance, '_cleared_post_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        refresh_tagged_posts(pk_set)
+
+
+@receiver(post_init, sender=Post)
+def remember_loaded_status(sender, instance, **kwargs):
+    # read through __dict__, a deferred status must not be loaded for this
+    instance._loaded_status = instance.__dict__.get('status')
+
+
+@receiver(pre_save, sender=Post)
+def remember_published_state(sender, instance, update_fields=None, **kwargs):
+    instance._was_published = None
+    if instance._state.adding or (update_fields is not None and 'status' not in update_fields):
+        return
+    if instance._loaded_status is None:
+        # status was deferred when the post was loaded, then assigned
+        instance._was_published = Post.published_objects.filter(pk=instance.pk).exists()
+    else:
+        instance._was_published = instance._loaded_status == "published"
+
+
+@receiver(post_save, sender=Post)
+def count_status_change(sender, instance, **kwargs):
+    was_published = getattr(instance, '_was_published', None)
+    is_published = instance.status == "published"
+    if was_published is not None and was_published != is_published:
+        delta = 1 if is_published else -1
+        adjust_published_counts({tag_id: delta for tag_id in instance.tags.values_list('pk', flat=True)})
+    instance._loaded_status = instance.__dict__.get('status')
+
+
+@receiver(pre_delete, sender=Post)
+def uncount_deleted_post(sender, instance, **kwargs):
+    # the cascade removes the links without sending m2m_changed
+    if instance.status == "published":
+        adjust_published_counts({tag_id: -1 for tag_id in instance.tags.values_list('pk', flat=True)})
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def count_tag_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ('pre_remove', 'pre_clear'):
+        # remove() reports every pk it was given, linked or not, and clear()
+        # none at all, so look the actual links up before they go
+        if reverse:
+            posts = instance.post_set.filter(status="published")
+            if action == 'pre_remove':
+                posts = posts.filter(pk__in=pk_set)
+            instance._unlinked = {instance.pk: -posts.count()}
+        elif instance.status == "published":
+            tags = instance.tags.all() if action == 'pre_clear' else instance.tags.filter(pk__in=pk_set)
+            instance._unlinked = {tag_id: -1 for tag_id in tags.values_list('pk', flat=True)}
+        else:
+            instance._unlinked = {}
+    elif action in ('post_remove', 'post_clear'):
+        adjust_published_counts(getattr(instance, '_unlinked', {}))
+    elif action == 'post_add':
+        if reverse:
+            adjust_published_counts({instance.pk: Post.published_objects.filter(pk__in=pk_set).count()})
+        elif instance.status == "published":
+            adjust_published_counts({tag_id: 1 for tag_id in pk_set})
+
+
+@receiver(post_delete, sender=Post)
+def remember_post_delete(sender, **kwargs):
+    record_post_delete()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Tags)
+@receiver(post_delete, sender=Tags)
+def invalidate_post_list_cache(sender, **kwargs):
+    invalidate_post_lists()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_detail_cache(sender, instance, **kwargs):
+    invalidate_post_details([instance.slug])
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_list_cache_on_tag_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_post_lists()
@@ -0,0 +1,50 @@
+from collections import Counter, defaultdict
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Post, Tags, TagStat
+
+
+def post_tag_names():
+    """
+    Expression for the tag names of a post, to store in its tag_names column.
+    """
+    names = Subquery(
+        Tags.objects.filter(post=OuterRef('pk')).order_by().values('post').
+        annotate(names=ArrayAgg('name', ordering='name')).values('names')
+    )
+    return Coalesce(names, Value([]), output_field=ArrayField(models.CharField(max_length=40)))
+
+
+def count_tag_links(post_ids):
+    """
+    Counter of tag id to the number of the given posts carrying that tag.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return Counter()
+    links = Post.tags.through.objects.filter(post_id__in=post_ids).order_by().\
+        values('tags_id').annotate(posts=Count('id')).values_list('tags_id', 'posts')
+    return Counter(dict(links))
+
+
+def adjust_published_counts(deltas):
+    """
+    Add `deltas`, a mapping of tag id to change, to the published post
+    counts. Tags sharing a change are updated by the same statement, so a
+    whole publish chunk costs a handful of queries.
+    """
+    deltas = {tag_id: delta for tag_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    TagStat.objects.bulk_create([TagStat(tag_id=tag_id) for tag_id in deltas], ignore_conflicts=True)
+    tags_by_delta = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        tags_by_delta[delta].append(tag_id)
+    for delta, tag_ids in tags_by_delta.items():
+        TagStat.objects.filter(tag_id__in=tag_ids).update(published_count=F('published_count') + delta)
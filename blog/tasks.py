@@ -1,38 +1,33 @@
-from datetime import datetime
 from celery import shared_task
 
-from utils import send_mail
-
-from .models import Post
+from .models import TYPES
+from .publishing import publish_posts
+from .renditions import render_post_cover
 
 
 @shared_task(name='publish_premium_posts')
 def publish_premium_posts():
-    posts = Post.valid_to_publish.filter(pub_date=datetime.today().date(), type="premium").select_related('author')
-
-    author_emails = set([post.author_email_address for post in posts])
-
-    posts.update(status="published")
-
-    if author_emails:
-        send_mail(
-            author_emails,
-            'Published premium posts',
-            f'Hello, your pending premium posts have been published'
-        )
+    return publish_posts("premium")
 
 
 @shared_task(name='publish_freemium_posts')
 def publish_freemium_posts():
-    posts = Post.valid_to_publish.filter(pub_date=datetime.today().date(), type="freemium").select_related('author')
+    return publish_posts("freemium")
+
 
-    author_emails = set([post.author_email_address for post in posts])
+@shared_task(name='publish_scheduled_posts')
+def publish_scheduled_posts():
+    """
+    Frequent sweep publishing posts whose publish_at has passed, one run
+    per post type so each keeps its own notification.
+    """
+    return {post_type: publish_posts(post_type, scheduled_only=True) for post_type, _ in TYPES}
 
-    posts.update(status="published")
 
-    if author_emails:
-        send_mail(
-            author_emails,
-            'Published freemium posts',
-            f'Hello, your pending freemium posts have been published'
-        )
+@shared_task(name='generate_cover_renditions')
+def generate_cover_renditions(post_id):
+    """
+    Resize a post's cover picture into the responsive renditions served by
+    the list endpoints.
+    """
+    return render_post_cover(post_id)
@@ -1,12 +1,26 @@
 from django.urls import path
 
+from . import async_views
 from .views import PostCreateApiView, AllPostListApiView, PostEditApiView, \
-    PostDeleteApiView, PostListApiView
+    PostDeleteApiView, PostListApiView, PostSearchApiView, PostListCacheStatsApiView, \
+    PostBulkCreateApiView, PostBulkEditApiView, PostExportApiView, TagListApiView, PostDetailApiView, \
+    PostEditHistoryApiView, PostEditActivityApiView
 
 urlpatterns = [
     path('posts/add', PostCreateApiView.as_view(), name='post_add'),
+    path('posts/bulk/add', PostBulkCreateApiView.as_view(), name='post_bulk_add'),
+    path('posts/bulk/edit', PostBulkEditApiView.as_view(), name='post_bulk_edit'),
     path('posts/all', AllPostListApiView.as_view(), name='post_list_all'),
+    path('posts/export', PostExportApiView.as_view(), name='post_export'),
     path('posts/edit/<str:slug>', PostEditApiView.as_view(), name='post_edit'),
+    path('posts/edits', PostEditActivityApiView.as_view(), name='post_edit_activity'),
+    path('posts/edits/<str:slug>', PostEditHistoryApiView.as_view(), name='post_edit_history'),
     path('posts/delete/<str:slug>', PostDeleteApiView.as_view(), name='post_delete'),
+    path('posts/cache/stats', PostListCacheStatsApiView.as_view(), name='post_list_cache_stats'),
+    path('posts/search', PostSearchApiView.as_view(), name='post_search'),
     path('posts', PostListApiView.as_view(), name='post_list_published'),
+    path('posts/detail/<str:slug>', PostDetailApiView.as_view(), name='post_detail'),
+    path('posts/async', async_views.post_list, name='post_list_published_async'),
+    path('posts/async/detail/<str:slug>', async_views.post_detail, name='post_detail_async'),
+    path('tags', TagListApiView.as_view(), name='tag_list'),
 ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework.permissions import BasePermission
 
 
@@ -9,3 +10,15 @@ class IsAuthenticatedAdmin(BasePermission):
     def has_permission(self, request, view):
         return bool(request.user and request.user.is_authenticated
                     and request.user.is_admin)
+
+
+def validate_bulk_payload(data):
+    """
+    Return an error message unless `data` is a non empty list of at most
+    BLOG_BULK_MAX_POSTS posts.
+    """
+    if not isinstance(data, list) or not data:
+        return "expected a non empty list of posts"
+    if len(data) > settings.BLOG_BULK_MAX_POSTS:
+        return f"at most {settings.BLOG_BULK_MAX_POSTS} posts can be sent at once"
+    return None
@@ -1,12 +1,30 @@
+import importlib
+
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.generics import CreateAPIView, ListAPIView, UpdateAPIView, DestroyAPIView
+from rest_framework.filters import SearchFilter
+from rest_framework.generics import CreateAPIView, GenericAPIView, ListAPIView, RetrieveAPIView, UpdateAPIView, \
+    DestroyAPIView
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters import rest_framework as filters
 
-from .models import Post, PostEdit
-from .serializers import PostCreateSerializer, PostListSerializer, PostEditSerializer
-from .utils import IsAuthenticatedAdmin
+from accounts.authentication import CachedTokenAuthentication
+
+from .cache import PostDetailCacheMixin, PostListCacheMixin, get_post_list_cache_stats
+from .conditional import ConditionalListMixin, if_match, post_etag
+from .export import EXPORT_FORMATS
+from .filters import PostFilter, PostSearchFilter
+from .models import Post, PostEdit, TagStat
+from .pagination import PostEditCursorPagination, PostPaginationMixin
+from .search import search_posts
+from .serializers import PostCreateSerializer, PostListSerializer, PostDetailSerializer, PostEditSerializer, \
+    BulkPostCreateSerializer, BulkPostEditSerializer, TagStatSerializer, PostEditHistorySerializer, \
+    PostEditActivitySerializer, serialize_post_rows
+from .utils import IsAuthenticatedAdmin, validate_bulk_payload
+
+db_router = importlib.import_module('ginger-edu-backend.db_router')
 
 
 class PostCreateApiView(CreateAPIView):
@@ -16,7 +34,7 @@ class PostCreateApiView(CreateAPIView):
     Authentication: Token based auth is required <br>
 
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticatedAdmin]
     serializer_class = PostCreateSerializer
 
@@ -33,62 +51,179 @@ class PostCreateApiView(CreateAPIView):
                             status=status.HTTP_400_BAD_REQUEST)
 
 
-class AllPostListApiView(ListAPIView):
+class AllPostListApiView(ConditionalListMixin, PostPaginationMixin, ListAPIView):
     """
     Get all posts
     Method get
     Format Json
+    Supports If-None-Match / If-Modified-Since
     """
 
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticatedAdmin]
     serializer_class = PostListSerializer
-    filter_backends = (filters.DjangoFilterBackend,)
-    filterset_fields = ('tags__name', 'status', 'type', 'pub_date', )
+    filter_backends = (filters.DjangoFilterBackend, SearchFilter, )
+    filterset_class = PostFilter
     search_fields = ('title', 'slug', )
 
+    def get_queryset(self):
+        return Post.objects.for_list()
+
     def list(self, request, *args, **kwargs):
-        query_set = Post.objects.all()
-        page = self.paginate_queryset(query_set)
-        serializer = self.get_serializer(page, many=True)
-        return Response({
-            "message": "All post list",
-            "count": self.paginator.count,
-            "next": self.paginator.get_next_link(),
-            "previous": self.paginator.get_previous_link(),
-            "data": serializer.data,
-        }, status=status.HTTP_200_OK)
+        query_set = self.filter_queryset(self.get_queryset())
+        validators, page = self.get_list_page(query_set)
+        not_modified = self.get_not_modified_response(*validators)
+        if not_modified is not None:
+            return not_modified
+
+        if page is None:
+            page = self.paginate_queryset(query_set.list_rows())
+        return self.get_paginated_response(serialize_post_rows(page, request), message="All post list")
+
+
+class PostExportApiView(GenericAPIView):
+    """
+    Stream every post, with author email and tags, for admins
+    Method get
+    Query param export_format: ndjson (default) or csv
+    Accepts the same filters as the all posts list
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticatedAdmin]
+    filter_backends = (filters.DjangoFilterBackend, SearchFilter, )
+    filterset_class = PostFilter
+    search_fields = ('title', 'slug', )
+
+    def get_queryset(self):
+        return Post.objects.all()
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response({"message": "unsupported export format",
+                             "errors": {"export_format": sorted(EXPORT_FORMATS)}},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        stream, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream(self.filter_queryset(self.get_queryset())),
+                                         content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="posts.{export_format}"'
+        return response
 
 
 class PostEditApiView(UpdateAPIView):
     """
     Update a post
-    Method put
+    Method get, put, patch
+    GET returns the post with its ETag. PATCH writes only the fields sent
+    and requires If-Match with that ETag, answering 412 once someone else
+    changed the post. PUT takes If-Match too, but does not require it.
     """
 
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticatedAdmin]
     queryset = Post.objects.all()
     serializer_class = PostEditSerializer
     lookup_field = 'slug'
 
+    def get(self, request, *args, **kwargs):
+        # the ETag is sent back with If-Match, a lagging replica would make it stale
+        with db_router.replica_reads(False):
+            post = Post.objects.for_detail().filter(slug=kwargs['slug']).first()
+            if post is None:
+                return Response({"message": "post not found"},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            return Response({"message": "Post detail",
+                             "data": PostDetailSerializer(post, context=self.get_serializer_context()).data},
+                            status=status.HTTP_200_OK, headers={'ETag': post_etag(post.updated)})
+
     def put(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance, data=request.data)
+        return self.edit(request, kwargs['slug'], partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        if 'HTTP_IF_MATCH' not in request.META:
+            return Response({"message": "If-Match header is required"},
+                            status=status.HTTP_428_PRECONDITION_REQUIRED)
+        return self.edit(request, kwargs['slug'], partial=True)
+
+    def edit(self, request, slug, partial):
+        """
+        Check the precondition and write the changes and their PostEdit in
+        one transaction, holding the post's row lock so concurrent editors
+        take turns instead of overwriting each other.
+        """
+        with transaction.atomic():
+            post = Post.objects.select_for_update().filter(slug=slug).first()
+            if post is None:
+                return Response({"message": "post not found"},
+                                status=status.HTTP_404_NOT_FOUND)
+            if not if_match(request, post_etag(post.updated)):
+                return Response({"message": "post was changed since it was read"},
+                                status=status.HTTP_412_PRECONDITION_FAILED,
+                                headers={'ETag': post_etag(post.updated)})
+
+            serializer = self.get_serializer(post, data=request.data, partial=partial)
+            if not serializer.is_valid():
+                return Response({"message": "post update failed", "errors": serializer.errors},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            post = serializer.save()
+            if serializer.changes:
+                PostEdit.objects.create(edited_by=request.user, post=post, changes=serializer.changes)
+
+        return Response({"message": "post updated",
+                        "data": serializer.data},
+                        status=status.HTTP_200_OK, headers={'ETag': post_etag(post.updated)})
+
+
+class PostEditHistoryApiView(PostPaginationMixin, ListAPIView):
+    """
+    Edits of a post, newest first, with the fields each one changed
+    Method get
+    Cursor paginated over the (post, -created, -id) index
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticatedAdmin]
+    serializer_class = PostEditHistorySerializer
+    cursor_pagination = True
+    cursor_pagination_class = PostEditCursorPagination
+
+    def get_queryset(self):
+        return PostEdit.objects.select_related('edited_by').\
+            only('created', 'changes', 'edited_by', 'edited_by__email')
 
-        if not instance:
+    def list(self, request, *args, **kwargs):
+        post_id = Post.objects.filter(slug=kwargs['slug']).values_list('pk', flat=True).first()
+        if post_id is None:
             return Response({"message": "post not found"},
                             status=status.HTTP_404_NOT_FOUND)
 
-        if serializer.is_valid():
-            post = serializer.save()
-            PostEdit.objects.create(edited_by=request.user, post=post)
-            return Response({"message": "post updated",
-                            "data": serializer.data},
-                            status=status.HTTP_200_OK)
-        else:
-            return Response({"message": "post update failed", "errors": serializer.errors},
-                            status=status.HTTP_400_BAD_REQUEST)
+        page = self.paginate_queryset(self.get_queryset().filter(post_id=post_id))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data,
+                                           message="Post edit history")
+
+
+class PostEditActivityApiView(PostPaginationMixin, ListAPIView):
+    """
+    Edits of all posts, newest first
+    Method get
+    Cursor paginated over the (-created, -id) index
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticatedAdmin]
+    serializer_class = PostEditActivitySerializer
+    cursor_pagination = True
+    cursor_pagination_class = PostEditCursorPagination
+
+    def get_queryset(self):
+        return PostEdit.objects.select_related('edited_by', 'post').\
+            only('created', 'changes', 'edited_by', 'edited_by__email', 'post', 'post__slug')
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(self.get_serializer(page, many=True).data,
+                                           message="Post edit activity")
 
 
 class PostDeleteApiView(DestroyAPIView):
@@ -97,7 +232,7 @@ class PostDeleteApiView(DestroyAPIView):
     Method delete
     """
 
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticatedAdmin]
     queryset = Post.objects.all()
     lookup_field = 'slug'
@@ -109,23 +244,190 @@ class PostDeleteApiView(DestroyAPIView):
         return self.destroy(request, *args, **kwargs)
 
 
-class PostListApiView(ListAPIView):
+class PostListApiView(PostListCacheMixin, ConditionalListMixin, PostPaginationMixin, ListAPIView):
     """
     Get only published posts
+    Pass pagination=cursor for keyset pagination (no count is returned)
+    Pages are served from the cache until a post is written
+    Supports If-None-Match / If-Modified-Since
     """
     serializer_class = PostListSerializer
-    filter_backends = (filters.DjangoFilterBackend,)
-    filterset_fields = ('tags__name', 'status', 'type', 'pub_date', )
+    cache_prefix = 'published'
+    filter_backends = (filters.DjangoFilterBackend, SearchFilter, )
+    filterset_class = PostFilter
     search_fields = ('title', 'slug', )
 
+    def get_queryset(self):
+        return Post.published_objects.for_list()
+
+    def list(self, request, *args, **kwargs):
+        entry = self.cache_lookup()
+
+        if entry is None:
+            query_set = self.filter_queryset(self.get_queryset())
+            validators, page = self.get_list_page(query_set)
+            not_modified = self.get_not_modified_response(*validators)
+            if not_modified is not None:
+                return not_modified
+
+            if page is None:
+                page = self.paginate_queryset(query_set.list_rows())
+            entry = {
+                "validators": validators,
+                "envelope": self.get_paginated_envelope("All published post list",
+                                                        serialize_post_rows(page, request)),
+            }
+            self.cache_store(entry)
+        else:
+            # the cached validators are exactly as fresh as the cached page
+            not_modified = self.get_not_modified_response(*entry["validators"])
+            if not_modified is not None:
+                return not_modified
+
+        return Response(entry["envelope"], status=status.HTTP_200_OK)
+
+
+class PostDetailApiView(PostDetailCacheMixin, RetrieveAPIView):
+    """
+    Get a published post, body included
+    Method get
+    Served from the cache until the post is written
+    """
+    serializer_class = PostDetailSerializer
+    lookup_field = 'slug'
+
+    def get_queryset(self):
+        return Post.published_objects.for_detail()
+
+    def retrieve(self, request, *args, **kwargs):
+        data = self.cache_lookup(kwargs['slug'])
+
+        if data is None:
+            post = self.get_queryset().filter(slug=kwargs['slug']).first()
+            if post is None:
+                return Response({"message": "post not found"},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            data = self.get_serializer(post).data
+            self.cache_store(data)
+
+        return Response({"message": "Post detail",
+                         "data": data},
+                        status=status.HTTP_200_OK, headers={'ETag': post_etag(data['updated'])})
+
+
+class PostListCacheStatsApiView(APIView):
+    """
+    Hit and miss counters of the published post list cache
+    Method get
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticatedAdmin]
+
+    def get(self, request, *args, **kwargs):
+        return Response({"message": "Post list cache stats",
+                         "data": get_post_list_cache_stats()},
+                        status=status.HTTP_200_OK)
+
+
+class PostSearchApiView(PostPaginationMixin, ListAPIView):
+    """
+    Full text search over published posts, best matches first
+    Method get
+    Query param q: the search terms
+    """
+    serializer_class = PostListSerializer
+    filter_backends = (filters.DjangoFilterBackend,)
+    filterset_class = PostSearchFilter
+
+    def use_cursor_pagination(self):
+        # results are ordered by rank, which a keyset cursor cannot seek on
+        return False
+
+    def get_queryset(self):
+        return Post.published_objects.for_list()
+
+    def list(self, request, *args, **kwargs):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response({"message": "search query is required"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        query_set = search_posts(self.filter_queryset(self.get_queryset()), text)
+        page = self.paginate_queryset(query_set.list_rows())
+        return self.get_paginated_response(serialize_post_rows(page, request), message="Post search results")
+
+
+class TagListApiView(ListAPIView):
+    """
+    Tags with their number of published posts, most used first
+    Method get
+    Read from the maintained counts, no posts are aggregated
+    """
+    serializer_class = TagStatSerializer
+
+    def get_queryset(self):
+        return TagStat.objects.filter(published_count__gt=0).select_related('tag').\
+            order_by('-published_count', 'tag__name')
+
     def list(self, request, *args, **kwargs):
-        query_set = Post.published_objects.all()
-        page = self.paginate_queryset(query_set)
-        serializer = self.get_serializer(page, many=True)
-        return Response({
-            "message": "All published post list",
-            "count": self.paginator.count,
-            "next": self.paginator.get_next_link(),
-            "previous": self.paginator.get_previous_link(),
-            "data": serializer.data,
-        }, status=status.HTTP_200_OK)
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response({"message": "Tag list",
+                         "data": serializer.data},
+                        status=status.HTTP_200_OK)
+
+
+class PostBulkCreateApiView(CreateAPIView):
+    """
+    Create many posts in one request
+    Method post
+    Body: a json array of posts, tags given by name
+    Authentication: Token based auth is required <br>
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticatedAdmin]
+    serializer_class = BulkPostCreateSerializer
+
+    def create(self, request, *args, **kwargs):
+        error = validate_bulk_payload(request.data)
+        if error:
+            return Response({"message": "post creation failed", "errors": error},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        if serializer.is_valid():
+            serializer.save(author=request.user)
+            return Response({"message": "posts created",
+                            "data": serializer.data},
+                            status=status.HTTP_201_CREATED)
+        else:
+            return Response({"message": "post creation failed",
+                            "errors": serializer.errors},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+
+class PostBulkEditApiView(GenericAPIView):
+    """
+    Update many posts in one request
+    Method put
+    Body: a json array of posts identified by slug, tags given by name
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticatedAdmin]
+    serializer_class = BulkPostEditSerializer
+
+    def put(self, request, *args, **kwargs):
+        error = validate_bulk_payload(request.data)
+        if error:
+            return Response({"message": "post update failed", "errors": error},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        if serializer.is_valid():
+            serializer.save(edited_by=request.user)
+            return Response({"message": "posts updated",
+                            "data": serializer.data},
+                            status=status.HTTP_200_OK)
+        else:
+            return Response({"message": "post update failed", "errors": serializer.errors},
+                            status=status.HTTP_400_BAD_REQUEST)
@@ -1,5 +1,5 @@
 """
-ASGI config for tell_all project.
+ASGI config for ginger-edu-backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
@@ -11,6 +11,6 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tell_all.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ginger-edu-backend.settings')
 
 application = get_asgi_application()
@@ -1,6 +1,15 @@
 from __future__ import absolute_import
+import logging
 import os
+import time
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_process_init
+from django.db import close_old_connections
+
+from . import task_metrics
+from .db_connections import drop_inherited_connections, recycle_connections
+
+logger = logging.getLogger(__name__)
 
 
 # set the default Django settings module for the 'celery' program.
@@ -16,3 +25,40 @@ app.autodiscover_tasks()
 @app.task(bind=True)
 def debug_task(self):
     print('Request: {0!r}'.format(self.request))
+
+
+# Database connections in workers follow CONN_MAX_AGE like web requests do:
+# each task is a unit of work, and a forked child opens its own connections.
+
+@worker_process_init.connect
+def close_inherited_db_connections(**kwargs):
+    drop_inherited_connections()
+
+
+@task_prerun.connect
+def prepare_db_connections(task=None, **kwargs):
+    # eager tasks run inside the caller's request and transaction
+    if task is not None and not getattr(task.request, 'is_eager', False):
+        recycle_connections()
+
+
+@task_postrun.connect
+def release_db_connections(task=None, **kwargs):
+    if task is not None and not getattr(task.request, 'is_eager', False):
+        close_old_connections()
+
+
+# Every task logs its duration and final state, with the phase timings and
+# row counts it reported through task_metrics.record().
+
+@task_prerun.connect
+def start_task_metrics(task_id=None, task=None, **kwargs):
+    task_metrics.start(task_id, task.name if task is not None else None)
+
+
+@task_postrun.connect
+def log_task_metrics(task_id=None, state=None, **kwargs):
+    metrics = task_metrics.finish(task_id)
+    if metrics is not None:
+        logger.info("Task %s[%s] %s in %.3fs%s", metrics.name, task_id, state,
+                    time.perf_counter() - metrics.started, metrics.summary())
@@ -0,0 +1,70 @@
+import asyncio
+import os
+
+from asgiref.sync import sync_to_async
+from django.db import DatabaseError, InterfaceError, close_old_connections, connections
+
+
+def expire_health_checks():
+    """
+    Have persistent connections checked again on their next use, so one
+    that stopped answering (database restart, idle timeout on a proxy) is
+    replaced instead of failing the query. Enabled per alias by
+    CONN_HEALTH_CHECKS, the setting Django 4.1 implements natively; the check
+    itself is in the ginger-edu-backend.postgresql backend.
+    """
+    for conn in connections.all():
+        conn.health_check_done = False
+
+
+def drop_inherited_connections():
+    """
+    Forget the connections a forked process inherited. Their socket is
+    closed first: a regular close() would send the server a terminate
+    message and break the parent's connection too.
+    """
+    for conn in connections.all():
+        if conn.connection is not None:
+            try:
+                os.close(conn.connection.fileno())
+            except OSError:
+                pass
+            try:
+                conn.close()
+            except (DatabaseError, InterfaceError):
+                pass
+
+
+def recycle_connections():
+    """
+    Between units of work (requests, tasks): drop broken connections and
+    those older than CONN_MAX_AGE, health check the rest on their next use.
+    """
+    close_old_connections()
+    expire_health_checks()
+
+
+class ConnectionHealthCheckMiddleware:
+    """
+    Health check persistent database connections on their first use in
+    each request; requests that never query cost no round trip.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # lets Django await the middleware instead of wrapping it in a thread
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        expire_health_checks()
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        # under ASGI sync views query on the thread sensitive thread
+        await sync_to_async(expire_health_checks)()
+        return await self.get_response(request)
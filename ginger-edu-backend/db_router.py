@@ -0,0 +1,119 @@
+import asyncio
+import contextvars
+import hashlib
+import random
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+PRIMARY = 'default'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# the replica the enclosed reads go to, None for the primary
+_replica = contextvars.ContextVar('replica', default=None)
+
+
+@contextmanager
+def replica_reads(allowed=True):
+    """
+    Allow (or forbid) reads from DATABASE_REPLICAS for the enclosed code.
+    One replica is picked for all of them, so a response never mixes rows
+    of replicas that lag differently.
+    """
+    replica = random.choice(settings.DATABASE_REPLICAS) if allowed and settings.DATABASE_REPLICAS else None
+    token = _replica.set(replica)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+def replica_reads_allowed():
+    return _replica.get() is not None
+
+
+def pin_key(request):
+    """
+    Cache key of the client's pin to the primary: token clients are told
+    apart by their Authorization header, others by their session. Clients
+    with neither are anonymous and never pinned, None.
+    """
+    client = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    return 'db:pin:' + hashlib.sha1(client.encode()).hexdigest() if client else None
+
+
+def wrote(request, response):
+    # failed and anonymous requests wrote nothing worth reading back
+    user = getattr(request, 'user', None)
+    return response.status_code < 400 and user is not None and user.is_authenticated
+
+
+class PrimaryReplicaRouter:
+    """
+    Reads go to the DATABASE_REPLICAS alias picked for the request while
+    replica reads are allowed, which ReplicaReadMiddleware only does for safe requests of
+    clients that did not write recently. Everything else (writes, unsafe
+    requests, Celery tasks, management commands) uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _replica.get() or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class ReplicaReadMiddleware:
+    """
+    Serve safe requests from the replicas, except for a client that
+    successfully wrote, authenticated, in the last
+    DATABASE_READ_YOUR_WRITES_SECONDS: its reads stay on the primary so it
+    sees its own writes despite replication lag.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = pin_key(request)
+        if request.method in SAFE_METHODS:
+            with replica_reads(key is None or not cache.get(key)):
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if key is not None and wrote(request, response):
+            cache.set(key, True, timeout=settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        # the context variable follows the request into sync_to_async threads
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        key = pin_key(request)
+        if request.method in SAFE_METHODS:
+            with replica_reads(key is None or not await sync_to_async(cache.get)(key)):
+                return await self.get_response(request)
+
+        response = await self.get_response(request)
+        if key is not None and await sync_to_async(wrote)(request, response):
+            await sync_to_async(cache.set)(key, True, timeout=settings.DATABASE_READ_YOUR_WRITES_SECONDS)
+        return response
@@ -0,0 +1,233 @@
+import asyncio
+import bisect
+import contextvars
+import hmac
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# statements listed when a slow request is logged, by total time
+SLOW_REQUEST_STATEMENTS = 5
+# other methods share one label value, clients cannot grow the series
+METHODS = {'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+def _format_labels(labels):
+    return ','.join('{}="{}"'.format(name, str(value).replace('\\', r'\\').replace('"', r'\"').
+                                     replace('\n', r'\n')) for name, value in labels)
+
+
+class Histogram:
+    """
+    Cumulative histogram per label set, in the Prometheus text format.
+    """
+
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name, self.documentation = name, documentation
+        self.label_names, self.buckets = label_names, buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # one count per bucket and +Inf, then the sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0]
+            series[index] += 1
+            series[-1] += value
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+
+        for labels, values in sorted(series.items()):
+            pairs = list(zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{_format_labels(pairs + [("le", bound)])}}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{_format_labels(pairs)}}} {values[-1]}')
+            lines.append(f'{self.name}_count{{{_format_labels(pairs)}}} {cumulative}')
+        return lines
+
+
+class Counter:
+
+    def __init__(self, name, documentation, label_names):
+        self.name, self.documentation, self.label_names = name, documentation, label_names
+        self._series = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def inc(self, labels):
+        with self._lock:
+            self._series[labels] += 1
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            series = dict(self._series)
+        for labels, value in sorted(series.items()):
+            lines.append(f'{self.name}{{{_format_labels(zip(self.label_names, labels))}}} {value}')
+        return lines
+
+
+LABELS = ('view', 'method')
+
+REQUEST_DURATION = Histogram('http_request_duration_seconds', "Wall time of a request.", LABELS,
+                             DURATION_BUCKETS)
+REQUEST_DB_QUERIES = Histogram('http_request_db_queries', "Database queries issued by a request.", LABELS,
+                               QUERY_BUCKETS)
+REQUEST_DB_DURATION = Histogram('http_request_db_duration_seconds', "Time a request spent in database queries.",
+                                LABELS, DURATION_BUCKETS)
+RESPONSE_SIZE = Histogram('http_response_size_bytes', "Size of a response body, streamed ones excluded.", LABELS,
+                          SIZE_BUCKETS)
+RESPONSES = Counter('http_responses_total', "Responses sent.", LABELS + ('status',))
+
+METRICS = (REQUEST_DURATION, REQUEST_DB_QUERIES, REQUEST_DB_DURATION, RESPONSE_SIZE, RESPONSES)
+
+
+def render_metrics():
+    return '\n'.join(line for metric in METRICS for line in metric.collect()) + '\n'
+
+
+class QueryCollector:
+    """
+    The queries of one request: count, total time and each statement.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def slowest_statements(self, limit=SLOW_REQUEST_STATEMENTS):
+        # repeated statements (N+1 queries) are grouped with their count
+        grouped = defaultdict(lambda: [0, 0.0])
+        for sql, elapsed in self.statements:
+            grouped[sql][0] += 1
+            grouped[sql][1] += elapsed
+        return sorted(((total, count, sql) for sql, (count, total) in grouped.items()), reverse=True)[:limit]
+
+
+_collector = contextvars.ContextVar('query_collector', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    execute_wrapper for every connection. It only times queries while a
+    request is collected; the context variable follows the request into
+    the threads that run its queries.
+    """
+    collector = _collector.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        collector.count += 1
+        collector.duration += elapsed
+        collector.statements.append((sql, elapsed))
+
+
+def instrument(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def instrument_new_connection(sender, connection, **kwargs):
+    instrument(connection)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record wall time, database queries and time, and response size per view,
+    and log the heaviest statements of requests slower than
+    METRICS_SLOW_REQUEST_SECONDS. Put it first to time the whole chain.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # connections opened before the middleware loaded
+        for connection in connections.all():
+            instrument(connection)
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        collector = QueryCollector()
+        token = _collector.set(collector)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _collector.reset(token)
+        self.record(request, response, collector, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        collector = QueryCollector()
+        token = _collector.set(collector)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _collector.reset(token)
+        self.record(request, response, collector, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, collector, duration):
+        match = request.resolver_match
+        labels = (match.view_name if match else 'unmatched',
+                  request.method if request.method in METHODS else 'other')
+
+        REQUEST_DURATION.observe(labels, duration)
+        REQUEST_DB_QUERIES.observe(labels, collector.count)
+        REQUEST_DB_DURATION.observe(labels, collector.duration)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(labels, len(response.content))
+        RESPONSES.inc(labels + (response.status_code,))
+
+        if duration >= settings.METRICS_SLOW_REQUEST_SECONDS:
+            logger.warning("Slow request %s %s (%s): %.3fs, %d queries in %.3fs%s",
+                           request.method, request.path, labels[0], duration, collector.count,
+                           collector.duration,
+                           ''.join(f"\n  {count}x {total:.3f}s {sql}"
+                                   for total, count, sql in collector.slowest_statements()))
+
+
+def metrics_view(request):
+    """
+    The request metrics of this process in the Prometheus text format.
+    Scrapers must send METRICS_TOKEN as a bearer token; without a token set
+    they are only served with METRICS_PUBLIC on.
+    """
+    if not settings.METRICS_TOKEN:
+        if not settings.METRICS_PUBLIC:
+            return HttpResponse(status=403)
+    elif not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {settings.METRICS_TOKEN}'):
+        return HttpResponse(status=403)
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
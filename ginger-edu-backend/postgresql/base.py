@@ -0,0 +1,35 @@
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL with the CONN_HEALTH_CHECKS of Django 4.1: a persistent
+    connection is checked the first time it is used after
+    db_connections.expire_health_checks(), which runs before each request and
+    task, so requests that never query (cache hits) pay no round trip.
+    """
+    health_check_done = False
+
+    def connect(self):
+        # a connection opened just now needs no check, set before connect()
+        # configures it through set_autocommit()
+        self.health_check_done = True
+        super().connect()
+
+    def close_if_health_check_failed(self):
+        # only between transactions, the connection can't be swapped in one
+        if self.connection is None or self.health_check_done or not self.autocommit \
+                or not self.settings_dict.get('CONN_HEALTH_CHECKS'):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
+
+    def set_autocommit(self, autocommit, force_begin_transaction_with_broken_autocommit=False):
+        # atomic() starts here, before its first query
+        self.close_if_health_check_failed()
+        return super().set_autocommit(autocommit, force_begin_transaction_with_broken_autocommit)
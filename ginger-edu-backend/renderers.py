@@ -0,0 +1,35 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# datetimes are handed to the DRF encoder so they keep its format
+# (orjson writes +00:00 where DRF writes Z)
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding through orjson when it is installed, byte for byte
+    the same output. Types orjson does not know (dates, lazy strings,
+    decimals, querysets) go through the DRF encoder. Falls back to the
+    stdlib encoder without orjson, for indented output (the browsable API)
+    and for JSON settings orjson cannot honour.
+
+    This is the default renderer; a view can still pick the plain
+    JSONRenderer through renderer_classes.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if orjson is None or self.ensure_ascii or not self.compact or not self.strict or \
+                self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        # same escaping as JSONRenderer, keeping the output a javascript subset
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_filters',
     'rest_framework.authtoken',
     'accounts',
@@ -48,6 +49,8 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'accounts.User'
 
 MIDDLEWARE = [
+    'ginger-edu-backend.metrics.RequestMetricsMiddleware',
+    'ginger-edu-backend.db_connections.ConnectionHealthCheckMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,6 +58,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'ginger-edu-backend.db_router.ReplicaReadMiddleware',
 ]
 
 ROOT_URLCONF = 'ginger-edu-backend.urls'
@@ -77,20 +81,43 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'ginger-edu-backend.wsgi.application'
 
+TEST_RUNNER = 'ginger-edu-backend.test_runner.EagerTaskTestRunner'
+
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        # django.db.backends.postgresql with connections health checked on first use
+        'ENGINE': 'ginger-edu-backend.postgresql',
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASSWORD'),
         'HOST': os.environ.get('DB_HOST'),
         'PORT': '5432',
+        # seconds a connection is kept open for later requests and tasks (0 closes
+        # it after each one); a reused connection is checked on its first query
+        # of each request or task
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replicas of the default database, as comma separated hosts. Safe
+# requests read from them, everything else uses the primary (see db_router)
+DATABASE_REPLICAS = []
+for index, host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))):
+    DATABASES[f'replica_{index}'] = dict(DATABASES['default'], HOST=host.strip(), TEST={'MIRROR': 'default'})
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['ginger-edu-backend.db_router.PrimaryReplicaRouter']
+# Seconds the reads of a client stay on the primary after it wrote
+DATABASE_READ_YOUR_WRITES_SECONDS = 5
+
+# Threads, and so database connections, per ASGI process that run the
+# queries of the async views (see blog.async_views)
+ASYNC_VIEW_THREADS = int(os.environ.get('ASYNC_VIEW_THREADS', 8))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -133,9 +160,42 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 5,
-    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend']
+    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # orjson backed when installed, the stdlib encoder otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'ginger-edu-backend.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Token authentication cache: seconds a token stays cached (the worst case
+# revocation delay on other processes) and entries kept per process
+TOKEN_AUTH_CACHE_TTL = 60
+TOKEN_AUTH_CACHE_SIZE = 1024
+
+# Request metrics, served in the Prometheus text format at /metrics. Set
+# METRICS_TOKEN to require it as a bearer token from scrapers; without one
+# /metrics answers 403 unless METRICS_PUBLIC opts into serving it to anyone
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+METRICS_PUBLIC = os.environ.get('METRICS_PUBLIC', '').lower() in ('1', 'true', 'yes')
+# Requests slower than this are logged with their heaviest SQL statements
+METRICS_SLOW_REQUEST_SECONDS = float(os.environ.get('METRICS_SLOW_REQUEST_SECONDS', 1))
+
+# Cache
+# Falls back to a per-process locmem cache. In production point CACHE_BACKEND
+# and CACHE_LOCATION at a redis cache backend on the celery redis instance.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'ginger-edu-backend'),
+    }
 }
 
+# Seconds a serialized page of the published post list is kept in the cache
+BLOG_POST_LIST_CACHE_TIMEOUT = 300
+# Seconds a serialized published post is kept in the cache
+BLOG_POST_DETAIL_CACHE_TIMEOUT = 300
+
 # Celery Broker - Redis
 BROKER_URL = os.environ.get('BROKER_URL')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND')
@@ -144,17 +204,45 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = "Africa/Lagos"
 CELERY_DEFAULT_QUEUE = "ginger-edu-backend"
-CELERY_BEAT_SCHEDULE = {
+# Run tasks in-process instead of queueing them, only when asked to (local
+# runs without a broker); the test runner turns it on for the suite
+CELERY_ALWAYS_EAGER = os.environ.get('CELERY_ALWAYS_EAGER', '').lower() in ('1', 'true', 'yes')
+# Seconds between sweeps publishing posts whose publish_at has passed
+BLOG_PUBLISH_SWEEP_SECONDS = 60
+# Old style name, matching the other celery settings above
+CELERYBEAT_SCHEDULE = {
     "publish_premium_posts": {
-        "task": "blog.tasks.publish_premium_posts",
+        "task": "publish_premium_posts",
         "schedule": crontab(hour=5, minute=0)
     },
     "publish_freemium_posts": {
-        "task": "blog.tasks.publish_freemium_posts",
+        "task": "publish_freemium_posts",
         "schedule": crontab(hour=15, minute=0)
+    },
+    "publish_scheduled_posts": {
+        "task": "publish_scheduled_posts",
+        "schedule": BLOG_PUBLISH_SWEEP_SECONDS
     }
 }
 
+# Largest batch accepted by the bulk create and bulk edit endpoints
+BLOG_BULK_MAX_POSTS = 5000
+
+# Posts read per round trip by the streaming admin export
+BLOG_EXPORT_CHUNK_SIZE = 2000
+
+# Posts published per transaction by the publish tasks
+BLOG_PUBLISH_CHUNK_SIZE = 500
+
+# Recipients handled by one notification delivery task
+BLOG_NOTIFICATION_BATCH_SIZE = 100
+
+# Widths of the resized cover picture copies, their encoder quality, and the
+# largest upload (in pixels) the rendition task agrees to decode
+BLOG_COVER_RENDITION_WIDTHS = (320, 640, 1280)
+BLOG_COVER_RENDITION_QUALITY = 80
+BLOG_COVER_MAX_PIXELS = 50_000_000
+
 # Email settings
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_USE_TLS = True
@@ -0,0 +1,54 @@
+import contextvars
+import time
+from collections import Counter
+
+
+class TaskMetrics:
+    """
+    What a running task reported: seconds per phase and row counts.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.phases = Counter()
+        self.rows = Counter()
+
+    def summary(self):
+        return ''.join([
+            ''.join(f' {phase}={seconds:.3f}s' for phase, seconds in self.phases.items()),
+            ''.join(f' {kind}={count}' for kind, count in self.rows.items()),
+        ])
+
+
+_current = contextvars.ContextVar('task_metrics', default=None)
+_tokens = {}
+
+
+def start(task_id, name):
+    _tokens[task_id] = _current.set(TaskMetrics(name))
+
+
+def finish(task_id):
+    """
+    Stop collecting for `task_id` and return what it reported, or None when
+    collection never started.
+    """
+    token = _tokens.pop(task_id, None)
+    if token is None:
+        return None
+    metrics = _current.get()
+    _current.reset(token)
+    return metrics
+
+
+def record(phases=None, **rows):
+    """
+    Add phase timings and row counts to the running task, if any. Outside a
+    task (management commands, tests calling functions directly) this does
+    nothing.
+    """
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.phases.update(phases or {})
+        metrics.rows.update(rows)
@@ -0,0 +1,19 @@
+from django.test.runner import DiscoverRunner
+
+from .celery import app
+
+
+class EagerTaskTestRunner(DiscoverRunner):
+    """
+    Runs the suite with Celery tasks executing in-process, as no broker is
+    available to the tests.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._always_eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+
+    def teardown_test_environment(self, **kwargs):
+        app.conf.task_always_eager = self._always_eager
+        super().teardown_test_environment(**kwargs)
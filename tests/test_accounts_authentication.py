@@ -0,0 +1,85 @@
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from accounts.authentication import TokenCache, token_cache
+from accounts.models import User
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        self.token = Token.objects.create(user=self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('post_list_cache_stats')
+
+    def test_cached_token_skips_auth_queries(self):
+        """
+        Ensure only the first request looks the token up
+        """
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        for _ in range(9):
+            with self.assertNumQueries(0):
+                self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.assertEqual(token_cache.misses, 1)
+        self.assertEqual(token_cache.hits, 9)
+
+    def test_token_delete_revokes_immediately(self):
+        self.client.get(self.url)
+        self.token.delete()
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_user_save_refreshes_snapshot(self):
+        self.client.get(self.url)
+
+        self.admin.is_admin = False
+        self.admin.save()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        self.admin.is_active = False
+        self.admin.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_snapshot_user_is_usable_as_author(self):
+        """
+        Ensure a request authenticated from the cache can still write posts
+        """
+        self.client.get(self.url)
+        response = self.client.post(reverse('post_add'), {
+            'title': 'Cached-author', 'summary': 'summarized', 'body': '<h1>Body</h1>',
+            'pub_date': '2999-01-01'})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.admin.blog_posts.get().title, 'Cached-author')
+        # the snapshot only holds a few fields, saving it must not wipe the rest
+        self.admin.refresh_from_db()
+        self.assertEqual(self.admin.email, 'admin1@tell-all.com')
+
+
+class TokenCacheTests(APITestCase):
+    def test_entries_expire_after_ttl(self):
+        now = [0]
+        cache = TokenCache(maxsize=10, ttl=60, timer=lambda: now[0])
+        cache.set('key', (1, 'admin', True, True))
+
+        now[0] = 59
+        self.assertIsNotNone(cache.get('key'))
+        now[0] = 60
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_dropped(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        cache.set('a', (1, 'a', True, True))
+        cache.set('b', (2, 'b', True, True))
+        cache.get('a')
+        cache.set('c', (3, 'c', True, True))
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
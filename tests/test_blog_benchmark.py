@@ -0,0 +1,77 @@
+import importlib
+import json
+from collections import Counter
+from io import StringIO
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from blog.management.commands.benchmark_blog import SCENARIOS
+from blog.management.commands.seed_blog import USER_PREFIX, seed
+from blog.models import Post, TagStat
+
+celery_app = importlib.import_module('ginger-edu-backend.celery').app
+
+
+class SeedBlogTests(TestCase):
+    def test_seed_is_reproducible_however_it_grows(self):
+        seed(120, users=10, tags=15, random_seed=3, batch_size=50)
+        grown = list(Post.objects.order_by('slug').values_list('slug', 'status', 'type', 'tag_names',
+                                                               'author__username'))
+        Post.objects.all().delete()
+
+        seed(45, users=10, tags=15, random_seed=3, batch_size=50)
+        self.assertEqual(seed(120, users=10, tags=15, random_seed=3, batch_size=50), 75)
+        self.assertEqual(list(Post.objects.order_by('slug').values_list('slug', 'status', 'type', 'tag_names',
+                                                                        'author__username')), grown)
+
+    def test_seeded_rows_are_consistent(self):
+        seed(200, users=10, tags=15)
+
+        posts = Post.objects.filter(author__username__startswith=USER_PREFIX)
+        self.assertEqual(posts.count(), 200)
+        self.assertFalse(posts.filter(search_vector__isnull=True).exists())
+        for post in posts.prefetch_related('tags'):
+            self.assertEqual(post.tag_names, sorted(tag.name for tag in post.tags.all()))
+
+        published = Counter(tag for tags in Post.published_objects.values_list('tag_names', flat=True)
+                            for tag in tags)
+        self.assertEqual(dict(TagStat.objects.filter(published_count__gt=0).
+                              values_list('tag__name', 'published_count')), dict(published))
+        # a few tags carry most posts
+        self.assertGreater(published.most_common(1)[0][1], published.most_common()[-1][1] * 3)
+
+
+class BenchmarkBlogTests(TestCase):
+    def test_reports_every_scenario_per_size_as_json(self):
+        cache.set('unrelated', 1)
+        out = StringIO()
+        call_command('benchmark_blog', sizes=[40, 80], requests=2, profile_requests=1, sweep_backlog=5,
+                     users=5, tags=10, stdout=out, stderr=StringIO())
+
+        report = json.loads(out.getvalue())
+        self.assertEqual([(result['posts'], result['scenario']) for result in report['results']],
+                         [(size, scenario) for size in (40, 80) for scenario in SCENARIOS])
+        for result in report['results']:
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertGreater(result['queries_per_request'], 0)
+            self.assertGreater(result['peak_memory_kb'], 0)
+
+        # every run was rolled back
+        self.assertEqual(Post.objects.count(), 80)
+        self.assertFalse(Post.objects.filter(summary__startswith='Benchmark').exists())
+        # the list scenarios leave the rest of the cache alone
+        self.assertEqual(cache.get('unrelated'), 1)
+
+    def test_publish_sweep_delivers_notifications_in_process(self):
+        # as run outside the suite, with tasks queued to a broker
+        self.addCleanup(setattr, celery_app.conf, 'task_always_eager', celery_app.conf.task_always_eager)
+        celery_app.conf.task_always_eager = False
+
+        call_command('benchmark_blog', sizes=[40], scenarios=['publish_sweep'], requests=1, profile_requests=1,
+                     sweep_backlog=5, users=5, tags=10, stdout=StringIO(), stderr=StringIO())
+
+        self.assertTrue(mail.outbox)
+        self.assertFalse(celery_app.conf.task_always_eager)
@@ -0,0 +1,133 @@
+import datetime
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post, PostEdit, Tags
+
+
+def post_payload(count, prefix="Bulk", tags=("python", "django")):
+    pub_date = (datetime.date.today() + datetime.timedelta(days=7)).isoformat()
+    return [{'title': f'{prefix}-{i}', 'summary': f'summarized-{i}', 'body': '<h1>Body</h1>',
+             'pub_date': pub_date, 'tags': list(tags)} for i in range(count)]
+
+
+class BlogBulkCreateTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        Tags.objects.create(name="python")
+        Tags.objects.create(name="django")
+        self.client.force_authenticate(user=self.admin)
+        self.url = reverse('post_bulk_add')
+
+    def test_bulk_create(self):
+        response = self.client.post(self.url, post_payload(3), format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row['slug'] for row in response.data['data']], ['bulk-0', 'bulk-1', 'bulk-2'])
+        post = Post.objects.get(slug='bulk-1')
+        self.assertEqual(post.author, self.admin)
+        self.assertEqual(sorted(post.tags.values_list('name', flat=True)), ['django', 'python'])
+        self.assertEqual(Post.objects.filter(search_vector='python').count(), 3)
+
+    def test_query_count_does_not_depend_on_batch_size(self):
+        counts = []
+        for size, prefix in ((5, 'Small'), (100, 'Large')):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, post_payload(size, prefix), format='json')
+            self.assertEqual(response.status_code, 201)
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_create_reports_invalid_rows(self):
+        Post.objects.create(title="Bulk-1", author=self.admin)
+        payload = post_payload(3)
+        payload[2]['tags'] = ['python', 'missing']
+        payload.append(dict(payload[0]))
+
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['errors']
+        self.assertEqual(errors[0], {})
+        self.assertIn('title', errors[1])
+        self.assertIn('tags', errors[2])
+        self.assertIn('title', errors[3])
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_bulk_create_rejects_non_lists(self):
+        response = self.client.post(self.url, post_payload(1)[0], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_large_import_is_batched(self):
+        """
+        Ensure a 2000 post import goes through one request in a handful of
+        statements, the posts inserted 1000 at a time
+        """
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, post_payload(5, 'Small'), format='json')
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(self.url, post_payload(2000), format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Post.objects.count(), 2005)
+        inserts = [query['sql'].split(' (')[0] for query in large if query['sql'].startswith('INSERT')]
+        self.assertEqual(inserts, ['INSERT INTO "blog_post"'] * 2 + ['INSERT INTO "blog_post_tags"'])
+        self.assertEqual(len(large), len(small) + 1)
+
+
+class BlogBulkEditTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        Tags.objects.create(name="python")
+        Tags.objects.create(name="django")
+        self.client.force_authenticate(user=self.admin)
+        self.client.post(reverse('post_bulk_add'), post_payload(4), format='json')
+        self.url = reverse('post_bulk_edit')
+
+    def test_bulk_edit(self):
+        response = self.client.put(self.url, [
+            {'slug': 'bulk-0', 'summary': 'edited-0', 'tags': ['django']},
+            {'slug': 'bulk-1', 'body': '<p>edited</p>', 'type': 'premium'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        first, second = Post.objects.get(slug='bulk-0'), Post.objects.get(slug='bulk-1')
+        self.assertEqual(first.summary, 'edited-0')
+        self.assertEqual(list(first.tags.values_list('name', flat=True)), ['django'])
+        self.assertEqual((second.body, second.type), ('<p>edited</p>', 'premium'))
+        self.assertEqual(sorted(second.tags.values_list('name', flat=True)), ['django', 'python'])
+        self.assertEqual(PostEdit.objects.filter(edited_by=self.admin).count(), 2)
+        self.assertGreater(first.updated, first.created)
+
+    def test_unchanged_posts_are_not_written(self):
+        etag = self.client.get(reverse('post_edit', args=['bulk-1']))['ETag']
+        updated = Post.objects.get(slug='bulk-1').updated
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(self.url, [
+                {'slug': 'bulk-0', 'summary': 'edited-0'},
+                {'slug': 'bulk-1', 'summary': 'summarized-1', 'tags': ['django', 'python']},
+            ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Post.objects.get(slug='bulk-1').updated, updated)
+        self.assertEqual(self.client.get(reverse('post_edit', args=['bulk-1']))['ETag'], etag)
+        self.assertEqual(list(PostEdit.objects.values_list('post__slug', flat=True)), ['bulk-0'])
+        self.assertFalse([query for query in queries if query['sql'].startswith('DELETE')])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.put(self.url, [{'slug': 'bulk-1', 'type': 'freemium'}], format='json')
+        self.assertFalse([query for query in queries if query['sql'].startswith(('UPDATE', 'INSERT', 'DELETE'))])
+
+    def test_bulk_edit_reports_unknown_slugs(self):
+        response = self.client.put(self.url, [{'slug': 'bulk-0', 'summary': 'edited'},
+                                              {'slug': 'missing', 'summary': 'edited'}], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('slug', response.data['errors'][1])
+        self.assertEqual(Post.objects.get(slug='bulk-0').summary, 'summarized-0')
@@ -0,0 +1,82 @@
+import datetime
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.cache import get_post_list_cache_stats
+from blog.models import Post, Tags
+from blog.tasks import publish_premium_posts
+
+
+class BlogPostListCacheTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        self.post = Post.objects.create(title="Cached-1", summary="summarized-1",
+                                        body="<h1>Body</h1>", status="published", author=self.admin)
+        self.url = reverse('post_list_published')
+
+    def get_list(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_second_request_is_served_from_cache(self):
+        """
+        Ensure a repeated request hits the cache and issues no queries
+        """
+        self.assertEqual(self.get_list()['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            response = self.get_list()
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data.get('data')[0]['slug'], 'cached-1')
+
+    def test_query_params_are_part_of_the_key(self):
+        self.get_list()
+        self.assertEqual(self.get_list(limit=1)['X-Cache'], 'MISS')
+        self.assertEqual(self.get_list(type='premium')['X-Cache'], 'MISS')
+        self.assertEqual(self.get_list(type='premium').data.get('data'), [])
+
+    def test_edit_invalidates_cached_pages(self):
+        """
+        Ensure edits, tag changes and deletes are never answered with a stale page
+        """
+        self.get_list()
+
+        self.post.summary = 'edited summary'
+        self.post.save()
+        self.assertEqual(self.get_list().data.get('data')[0]['summary'], 'edited summary')
+
+        self.post.tags.add(Tags.objects.create(name='cached'))
+        self.assertEqual(self.get_list().data.get('data')[0]['tags'], ['cached'])
+
+        self.post.delete()
+        self.assertEqual(self.get_list().data.get('data'), [])
+
+    def test_publish_task_invalidates_cached_pages(self):
+        """
+        Ensure posts published through QuerySet.update show up straight away
+        """
+        Post.objects.create(title="Premium-1", summary="summarized-premium", body="<h1>Body</h1>",
+                            cover_picture="cover-picture/premium.png", type="premium",
+                            pub_date=datetime.date.today(), author=self.admin)
+        self.assertEqual(self.get_list().data.get('count'), 1)
+
+        publish_premium_posts()
+
+        self.assertEqual(self.get_list().data.get('count'), 2)
+
+    def test_cache_stats(self):
+        before = get_post_list_cache_stats()
+        self.get_list()
+        self.get_list()
+        self.get_list()
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('post_list_cache_stats'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['misses'] - before['misses'], 1)
+        self.assertEqual(response.data['data']['hits'] - before['hits'], 2)
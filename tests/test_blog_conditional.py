@@ -0,0 +1,99 @@
+import datetime
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.cache import POSTS_LAST_DELETE_KEY
+from blog.models import Post, Tags
+from blog.tasks import publish_freemium_posts
+
+
+class BlogConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        self.post = Post.objects.create(title="Conditional-1", summary="summarized-1",
+                                        body="<h1>Body</h1>", status="published", author=self.admin)
+        Post.objects.create(title="Conditional-2", summary="summarized-2", body="<h1>Body</h1>",
+                            cover_picture="cover-picture/conditional.png",
+                            pub_date=datetime.date.today(), author=self.admin)
+        # keep Last-Modified clear of the one second resolution of HTTP dates
+        Post.objects.update(updated=timezone.now() - datetime.timedelta(hours=1))
+        cache.delete(POSTS_LAST_DELETE_KEY)
+        self.client.force_authenticate(user=self.admin)
+
+    def assert_not_modified(self, url, **headers):
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        return response
+
+    def assert_modified(self, url, **headers):
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_validators_are_sent(self):
+        for url in (reverse('post_list_all'), reverse('post_list_published')):
+            response = self.assert_modified(url)
+            self.assertTrue(response['ETag'])
+            self.assertTrue(response['Last-Modified'])
+
+    def test_if_none_match_skips_serialization(self):
+        """
+        Ensure a matching ETag costs only the validator query on the admin list
+        """
+        url = reverse('post_list_all')
+        etag = self.assert_modified(url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.assert_not_modified(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response['ETag'], etag)
+
+        # another page of the same data has its own validator
+        self.assert_modified(url + '?limit=1', HTTP_IF_NONE_MATCH=etag)
+
+    def test_cursor_pages_are_validated_by_their_rows(self):
+        """
+        Ensure cursor pages answer a matching ETag from the page query alone
+        """
+        url = reverse('post_list_all') + '?pagination=cursor&limit=1'
+        etag = self.assert_modified(url)['ETag']
+
+        with self.assertNumQueries(1):
+            self.assert_not_modified(url, HTTP_IF_NONE_MATCH=etag)
+
+        # a post outside the page leaves it current, one on it does not
+        Post.objects.filter(pk=self.post.pk).update(summary="edited", updated=timezone.now())
+        self.assert_not_modified(url, HTTP_IF_NONE_MATCH=etag)
+        Post.objects.exclude(pk=self.post.pk).update(summary="edited", updated=timezone.now())
+        self.assert_modified(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_etag_changes_on_edit_tags_and_publish(self):
+        for url in (reverse('post_list_all'), reverse('post_list_published')):
+            etag = self.assert_modified(url)['ETag']
+            self.assert_not_modified(url, HTTP_IF_NONE_MATCH=etag)
+
+            self.post.tags.add(Tags.objects.get_or_create(name="conditional")[0])
+            etag = self.assert_modified(url, HTTP_IF_NONE_MATCH=etag)['ETag']
+
+            self.post.summary = f'edited for {url}'
+            self.post.save()
+            etag = self.assert_modified(url, HTTP_IF_NONE_MATCH=etag)['ETag']
+            self.assert_not_modified(url, HTTP_IF_NONE_MATCH=etag)
+
+        # the publish task flips status with QuerySet.update
+        etag = self.assert_modified(reverse('post_list_published'))['ETag']
+        publish_freemium_posts()
+        response = self.assert_modified(reverse('post_list_published'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.data.get('count'), 2)
+
+    def test_if_modified_since(self):
+        url = reverse('post_list_all')
+        last_modified = self.assert_modified(url)['Last-Modified']
+        self.assert_not_modified(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        Post.objects.get(title="Conditional-2").delete()
+        self.assert_modified(url, HTTP_IF_MODIFIED_SINCE=last_modified)
@@ -0,0 +1,85 @@
+import csv
+import json
+import tracemalloc
+from io import StringIO
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post, Tags
+
+
+class BlogExportTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        python = Tags.objects.create(name="python")
+        django = Tags.objects.create(name="django")
+        for i in range(3):
+            post = Post.objects.create(title=f"Post-{i}", summary=f"summarized, {i}", body="<h1>Body</h1>",
+                                       status="published" if i else "draft", author=self.admin)
+            post.tags.set([python, django] if i else [python])
+        self.client.force_authenticate(user=self.admin)
+        self.url = reverse('post_export')
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        response, content = self.export()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['slug'] for row in rows], ['post-0', 'post-1', 'post-2'])
+        self.assertEqual(rows[1]['author_email'], 'admin1@tell-all.com')
+        self.assertEqual(rows[1]['tags'], ['django', 'python'])
+        self.assertEqual(rows[0]['summary'], 'summarized, 0')
+
+    def test_csv_export(self):
+        response, content = self.export(export_format='csv')
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('posts.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual([row['slug'] for row in rows], ['post-0', 'post-1', 'post-2'])
+        self.assertEqual(rows[0]['summary'], 'summarized, 0')
+        self.assertEqual(rows[2]['tags'], 'django,python')
+
+    def test_export_applies_filters(self):
+        _, content = self.export(status='published', tags__name='django')
+
+        self.assertEqual([json.loads(line)['slug'] for line in content.splitlines()], ['post-1', 'post-2'])
+
+    def test_export_rejects_unknown_formats(self):
+        response = self.client.get(self.url, {'export_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_is_admin_only(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertIn(response.status_code, (401, 403))
+
+    @override_settings(BLOG_EXPORT_CHUNK_SIZE=200)
+    def test_peak_memory_does_not_grow_with_table_size(self):
+        """
+        Benchmark: peak memory of streaming 6x more posts stays flat
+        """
+        peaks = []
+        created = 3
+        for total in (1000, 6000):
+            Post.objects.bulk_create([Post(title=f"Bulk-{i}", slug=f"bulk-{i}", body="x" * 1000,
+                                           tag_names=['python', 'django'], author=self.admin)
+                                      for i in range(created, total)])
+            created = total
+
+            response = self.client.get(self.url)
+            tracemalloc.start()
+            lines = sum(chunk.count(b'\n') for chunk in response.streaming_content)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            self.assertEqual(lines, total)
+
+        self.assertLess(peaks[1], peaks[0] * 1.5, peaks)
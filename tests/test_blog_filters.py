@@ -0,0 +1,103 @@
+import datetime
+from unittest import skipUnless
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post, Tags
+
+
+class BlogFilterTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        python = Tags.objects.create(name="python")
+        django = Tags.objects.create(name="django")
+        for i in range(6):
+            post = Post.objects.create(title=f"Post-{i}", summary=f"summarized-{i}",
+                                       body="<h1>Body</h1>", author=self.admin,
+                                       status="published" if i % 2 else "draft",
+                                       type="premium" if i < 3 else "freemium",
+                                       pub_date=datetime.date(2022, 12, i + 1))
+            post.tags.set([python] if i < 4 else [django])
+
+    def test_published_list_filters(self):
+        """
+        Ensure the declared filterset fields are applied to the published list
+        """
+        url = reverse('post_list_published')
+
+        response = self.client.get(url, {'type': 'premium'})
+        self.assertEqual([row['slug'] for row in response.data.get('data')], ['post-1'])
+
+        response = self.client.get(url, {'tags__name': 'django'})
+        self.assertEqual([row['slug'] for row in response.data.get('data')], ['post-5'])
+        self.assertEqual(response.data.get('count'), 1)
+
+        response = self.client.get(url, {'pub_date': '2022-12-04'})
+        self.assertEqual([row['slug'] for row in response.data.get('data')], ['post-3'])
+
+        response = self.client.get(url, {'status': 'draft'})
+        self.assertEqual(response.data.get('data'), [])
+
+    def test_all_post_list_filters_and_search(self):
+        """
+        Ensure the admin list applies filters and search on title and slug
+        """
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('post_list_all')
+
+        response = self.client.get(url, {'status': 'draft', 'type': 'premium'})
+        self.assertEqual(response.data.get('count'), 2)
+
+        response = self.client.get(url, {'search': 'post-4'})
+        self.assertEqual([row['slug'] for row in response.data.get('data')], ['post-4'])
+
+        response = self.client.get(url, {'tags__name': 'python', 'limit': 10})
+        self.assertEqual(response.data.get('count'), 4)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN output is PostgreSQL specific')
+class BlogIndexUsageTests(APITestCase):
+    def setUp(self):
+        admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        tags = Tags.objects.bulk_create([Tags(name=f"tag-{i}") for i in range(50)] + [Tags(name="python")])
+        # enough rows, spread over statuses, types, days and tags, that the
+        # planner picks indexes by selectivity rather than by their size
+        posts = Post.objects.bulk_create([
+            Post(title=f"Post-{i}", slug=f"post-{i}", summary=f"summarized-{i}", body="<h1>Body</h1>",
+                 status=("draft", "published")[i % 2], type=("freemium", "premium")[i // 2 % 2],
+                 pub_date=datetime.date(2022, 12, 1) + datetime.timedelta(days=i % 100), author=admin)
+            for i in range(2000)
+        ])
+        Post.tags.through.objects.bulk_create([Post.tags.through(post=post, tags=tags[i % len(tags)])
+                                               for i, post in enumerate(posts)])
+
+        # the planner prefers sequential scans on tiny tables, take that option away
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            cursor.execute('ANALYZE blog_post')
+            cursor.execute('ANALYZE blog_post_tags')
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = on')
+
+    def test_published_feed_uses_status_created_index(self):
+        plan = Post.published_objects.order_by('-created')[:5].explain()
+        self.assertIn('blog_post_status_created_idx', plan)
+
+    def test_publish_sweep_uses_status_type_pub_date_index(self):
+        plan = Post.objects.filter(status='draft', type='premium',
+                                   pub_date=datetime.date(2022, 12, 1)).explain()
+        self.assertIn('blog_post_status_type_pub_idx', plan)
+
+    def test_tag_join_uses_tag_post_index(self):
+        tag = Tags.objects.get(name="python")
+        # post ids in order for the join, which Django's tags_id index can't give
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_sort = off')
+        plan = Post.tags.through.objects.filter(tags=tag).order_by('post_id').\
+            values_list('post_id', flat=True).explain()
+        self.assertIn('blog_post_tags_tag_post_idx', plan)
@@ -0,0 +1,69 @@
+import os
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from accounts.models import User
+from blog.models import Post, Tags
+from blog.serializers import PostListSerializer, serialize_post_rows
+
+
+class BlogListRowsTests(APITestCase):
+    def setUp(self):
+        admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        tags = [Tags.objects.create(name=name) for name in ("zope", "Django", "celery", "python")]
+        for i in range(6):
+            post = Post.objects.create(title=f"Post-{i}", summary=f"summarized \"{i}\" é" if i % 3 else None,
+                                       body="<h1>Body</h1>", author=admin,
+                                       status="published" if i % 2 else "draft",
+                                       type="premium" if i < 3 else "freemium",
+                                       cover_picture=f"cover-picture/post-{i}.png" if i % 2 else None)
+            post.tags.set(tags[i % 4:])
+        Post.objects.filter(slug='post-1').update(cover_renditions={
+            'source': 'cover-picture/post-1.png', 'width': 640, 'height': 320, 'placeholder': 'data:image/jpeg;base64,AA',
+            'renditions': {'webp': [{'name': 'cover-picture/renditions/post-1-320w.webp', 'width': 320,
+                                     'height': 160, 'size': 100}],
+                           'jpeg': [{'name': 'cover-picture/renditions/post-1-320w.jpeg', 'width': 320,
+                                     'height': 160, 'size': 120}]}})
+        # renditions of a replaced cover are not exposed
+        Post.objects.filter(slug='post-3').update(cover_renditions={'source': 'cover-picture/old.png'})
+        self.request = Request(APIRequestFactory().get('/blog/posts'))
+
+    def test_fast_path_matches_serializer_byte_for_byte(self):
+        reference = PostListSerializer(Post.objects.for_list(), many=True, context={'request': self.request}).data
+        fast_path = serialize_post_rows(list(Post.objects.for_list().list_rows()), self.request)
+
+        self.assertEqual(JSONRenderer().render(fast_path), JSONRenderer().render(reference))
+        self.assertEqual(JSONRenderer().render(serialize_post_rows(list(Post.objects.list_rows()))),
+                         JSONRenderer().render(PostListSerializer(Post.objects.for_list(), many=True).data))
+
+    def test_list_endpoint_matches_serializer(self):
+        response = self.client.get(reverse('post_list_published'), {'limit': 10})
+        reference = PostListSerializer(Post.published_objects.for_list(), many=True,
+                                       context={'request': response.wsgi_request}).data
+
+        self.assertEqual(JSONRenderer().render(response.data['data']), JSONRenderer().render(reference))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_list_serializers', rows=[50, 500], repeat=1, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].lstrip().startswith('500 rows'))
+        self.assertRegex(lines[1], r' [\d.]+x$')
+
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), 'timings depend on the machine, set RUN_BENCHMARKS to run')
+    def test_list_rows_are_faster(self):
+        """
+        Benchmark: the list_rows() fast path against PostListSerializer
+        """
+        out = StringIO()
+        call_command('benchmark_list_serializers', rows=[500], repeat=5, stdout=out)
+
+        self.assertGreater(float(out.getvalue().split()[-1].rstrip('x')), 1, out.getvalue())
@@ -0,0 +1,129 @@
+import os
+import time
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest import mock, skipUnless
+
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from blog import notifications
+from blog.notifications import close_worker_connection, notify_authors
+
+
+class FlakyConnection:
+    """
+    Email connection that refuses one address and drops the first send
+    """
+
+    def __init__(self, refused=None, disconnect_once=False, reported=None):
+        self.refused = refused
+        # the address as the server reports it back
+        self.reported = reported or refused
+        self.disconnect_once = disconnect_once
+        self.sent = []
+        self.closed = False
+
+    def open(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def send_messages(self, messages):
+        if self.disconnect_once:
+            self.disconnect_once = False
+            raise SMTPServerDisconnected('connection dropped')
+        for message in messages:
+            if self.refused in message.to:
+                raise SMTPRecipientsRefused({self.reported: (550, b'no such user')})
+            self.sent.extend(message.to)
+        return len(messages)
+
+
+@override_settings(BLOG_NOTIFICATION_BATCH_SIZE=100)
+class BlogNotificationTests(TestCase):
+    def setUp(self):
+        close_worker_connection()
+        self.addCleanup(close_worker_connection)
+
+    def test_each_author_gets_a_private_message(self):
+        recipients = [f'author-{i}@tell-all.com' for i in range(250)]
+
+        with mock.patch.object(notifications.deliver_notifications, 'delay',
+                               wraps=notifications.deliver_notifications.delay) as delay:
+            notify_authors(recipients + [recipients[0], ''], 'Published', 'Hello', dedup_id='run-1')
+
+        self.assertEqual(delay.call_count, 3)
+        self.assertEqual(len(mail.outbox), 250)
+        self.assertTrue(all(len(message.to) == 1 for message in mail.outbox))
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), sorted(recipients))
+
+    def test_recipients_are_deduplicated_per_run(self):
+        notify_authors(['author@tell-all.com'], 'Published', 'Hello', dedup_id='run-2')
+        notify_authors(['author@tell-all.com'], 'Published', 'Hello', dedup_id='run-2')
+        notify_authors(['author@tell-all.com'], 'Published', 'Hello', dedup_id='run-3')
+
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_connection_is_reused_across_batches(self):
+        with mock.patch.object(notifications, 'get_connection',
+                               wraps=notifications.get_connection) as get_connection:
+            notify_authors([f'author-{i}@tell-all.com' for i in range(300)], 'Published', 'Hello',
+                           dedup_id='run-4')
+
+        self.assertEqual(get_connection.call_count, 1)
+        self.assertEqual(len(mail.outbox), 300)
+
+    def test_refused_address_does_not_fail_the_batch(self):
+        connection = FlakyConnection(refused='bad@tell-all.com')
+
+        with mock.patch.object(notifications, 'get_connection', return_value=connection):
+            notify_authors(['a@tell-all.com', 'bad@tell-all.com', 'c@tell-all.com'], 'Published', 'Hello',
+                           dedup_id='run-5')
+
+        self.assertEqual(connection.sent, ['a@tell-all.com', 'c@tell-all.com'])
+
+    def test_unmatched_refusal_fails_the_batch(self):
+        connection = FlakyConnection(refused='bad@tell-all.com', reported='BAD@TELL-ALL.COM')
+
+        with mock.patch.object(notifications, 'get_connection', return_value=connection):
+            with self.assertRaises(SMTPRecipientsRefused):
+                notifications.deliver_notifications(['a@tell-all.com', 'bad@tell-all.com'], 'Published', 'Hello',
+                                                    'run-8')
+
+        self.assertTrue(connection.closed)
+        self.assertIsNone(notifications._connection)
+
+    def test_dropped_connection_is_retried(self):
+        connection = FlakyConnection(disconnect_once=True)
+
+        with mock.patch.object(notifications, 'get_connection', return_value=connection):
+            notify_authors(['a@tell-all.com', 'b@tell-all.com'], 'Published', 'Hello', dedup_id='run-6')
+
+        self.assertEqual(connection.sent, ['a@tell-all.com', 'b@tell-all.com'])
+
+    def test_each_batch_is_sent_at_once(self):
+        connection = FlakyConnection()
+        recipients = [f'author-{i}@tell-all.com' for i in range(250)]
+
+        with mock.patch.object(notifications, 'get_connection', return_value=connection), \
+                mock.patch.object(connection, 'send_messages', wraps=connection.send_messages) as send_messages:
+            notify_authors(recipients, 'Published', 'Hello', dedup_id='run-7')
+
+        self.assertEqual([len(call.args[0]) for call in send_messages.call_args_list], [100, 100, 50])
+        self.assertEqual(sorted(connection.sent), sorted(recipients))
+
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), 'timings depend on the machine, set RUN_BENCHMARKS to run')
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+    def test_delivery_throughput(self):
+        """
+        Benchmark: notifications delivered per second through the locmem backend
+        """
+        recipients = [f'author-{i}@tell-all.com' for i in range(2000)]
+
+        started = time.perf_counter()
+        notify_authors(recipients, 'Published', 'Hello', dedup_id='run-9')
+        rate = len(recipients) / (time.perf_counter() - started)
+
+        self.assertEqual(len(mail.outbox), 2000)
+        self.assertGreater(rate, 500, f'{rate:.0f} messages/s')
@@ -0,0 +1,65 @@
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIRequestFactory
+
+from accounts.models import User
+from blog.models import Post
+from blog.pagination import PostCursorPagination
+from blog.views import PostListApiView
+
+
+class BlogCursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        for i in range(12):
+            Post.objects.create(title=f"Post-{i}", summary=f"summarized-{i}",
+                                body="<h1>Body</h1>", status="published", author=self.admin)
+
+    def test_cursor_pagination_skips_count(self):
+        """
+        Ensure cursor pages keep the envelope and issue no COUNT query
+        """
+        url = reverse('post_list_published')
+
+        # page of posts joined with authors, tags for the page
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'pagination': 'cursor', 'limit': 5})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data.keys()), {'message', 'count', 'next', 'previous', 'data'})
+        self.assertIsNone(response.data.get('count'))
+        self.assertEqual(len(response.data.get('data')), 5)
+        self.assertIsNotNone(response.data.get('next'))
+
+    def test_cursor_pagination_walks_every_post_once(self):
+        """
+        Ensure following next links returns every post in ordering, without duplicates
+        """
+        url = reverse('post_list_published') + '?pagination=cursor&limit=5'
+        slugs = []
+
+        while url:
+            response = self.client.get(url)
+            slugs.extend(row['slug'] for row in response.data.get('data'))
+            url = response.data.get('next')
+
+        expected = list(Post.published_objects.order_by('-created', '-id').values_list('slug', flat=True))
+        self.assertEqual(slugs, expected)
+
+    def test_cursor_pagination_per_view(self):
+        """
+        Ensure a view can opt into cursor pagination without the query parameter
+        """
+        view = PostListApiView(cursor_pagination=True)
+        view.request = Request(APIRequestFactory().get(reverse('post_list_published')))
+
+        self.assertIsInstance(view.paginator, PostCursorPagination)
+
+    def test_default_pagination_is_unchanged(self):
+        """
+        Ensure limit/offset pagination and the count are still the default
+        """
+        response = self.client.get(reverse('post_list_published'))
+
+        self.assertEqual(response.data.get('count'), 12)
+        self.assertEqual(len(response.data.get('data')), 5)
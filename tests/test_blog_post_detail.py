@@ -0,0 +1,99 @@
+import datetime
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post, Tags
+from blog.tasks import publish_premium_posts
+
+
+class BlogPostDetailTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        self.post = Post.objects.create(title="Detail-1", summary="summarized-1", body="<h1>Body</h1>",
+                                        status="published", author=self.admin)
+        self.post.tags.add(Tags.objects.create(name="python"))
+        self.other = Post.objects.create(title="Detail-2", summary="summarized-2", body="<h1>Other</h1>",
+                                         status="published", author=self.admin)
+
+    def get_detail(self, slug='detail-1', **extra):
+        return self.client.get(reverse('post_detail', args=[slug]), **extra)
+
+    def test_detail(self):
+        response = self.get_detail()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['message'], "Post detail")
+        data = response.data['data']
+        self.assertEqual((data['title'], data['body'], data['tags']), ("Detail-1", "<h1>Body</h1>", ['python']))
+        self.assertEqual(data['author_email_address'], 'admin1@tell-all.com')
+
+    def test_only_published_posts_are_found(self):
+        Post.objects.create(title="Draft-1", body="<h1>Draft</h1>", author=self.admin)
+
+        response = self.get_detail('draft-1')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data, {"message": "post not found"})
+        self.assertEqual(self.get_detail('missing').status_code, 404)
+
+    def test_second_request_is_served_from_cache(self):
+        """
+        Ensure a repeated request hits the cache and issues no queries
+        """
+        self.assertEqual(self.get_detail()['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            response = self.get_detail()
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['data']['body'], "<h1>Body</h1>")
+
+    def test_host_is_part_of_the_key(self):
+        self.get_detail()
+        self.assertEqual(self.get_detail(HTTP_HOST='testserver:8000')['X-Cache'], 'MISS')
+
+    def test_writes_invalidate_only_their_post(self):
+        """
+        Ensure edits, tag changes and deletes are never answered with a stale post
+        """
+        self.get_detail()
+        self.get_detail('detail-2')
+
+        self.post.body = '<h1>Edited</h1>'
+        self.post.save()
+        self.assertEqual(self.get_detail().data['data']['body'], '<h1>Edited</h1>')
+        self.assertEqual(self.get_detail('detail-2')['X-Cache'], 'HIT')
+
+        Tags.objects.filter(name="python").get().post_set.add(self.other)
+        self.assertEqual(self.get_detail('detail-2').data['data']['tags'], ['python'])
+
+        tag = Tags.objects.get(name="python")
+        tag.name = "py"
+        tag.save()
+        self.assertEqual(self.get_detail().data['data']['tags'], ['py'])
+
+        self.post.delete()
+        self.assertEqual(self.get_detail().status_code, 404)
+
+    def test_bulk_edit_invalidates_cached_posts(self):
+        self.get_detail()
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.put(reverse('post_bulk_edit'), [{'slug': 'detail-1', 'body': '<h1>Bulk</h1>'}],
+                                   format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_detail().data['data']['body'], '<h1>Bulk</h1>')
+
+    def test_published_posts_show_up_straight_away(self):
+        Post.objects.create(title="Premium-1", summary="summarized-premium", body="<h1>Body</h1>",
+                            cover_picture="cover-picture/premium.png", type="premium",
+                            pub_date=datetime.date.today(), author=self.admin)
+        self.assertEqual(self.get_detail('premium-1').status_code, 404)
+
+        publish_premium_posts()
+
+        self.assertEqual(self.get_detail('premium-1').data['data']['status'], 'published')
@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post, PostEdit, Tags, TagStat
+
+
+class BlogPostEditTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        self.post = Post.objects.create(title="Edit-1", summary="summarized-1", body="<h1>Body</h1>",
+                                        status="published", author=self.admin)
+        self.post.tags.add(Tags.objects.create(name="python"))
+        Tags.objects.create(name="django")
+        self.url = reverse('post_edit', args=['edit-1'])
+        self.client.force_authenticate(user=self.admin)
+
+    def read_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def patch(self, data, etag):
+        return self.client.patch(self.url, data, format='json', HTTP_IF_MATCH=etag)
+
+    def test_get_returns_the_post_and_its_etag(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['data']['title'], "Edit-1")
+        self.assertEqual(response['ETag'], f'"{response.data["data"]["updated"]}"')
+        # the public detail carries the same validator
+        self.assertEqual(self.client.get(reverse('post_detail', args=['edit-1']))['ETag'], response['ETag'])
+        self.assertEqual(self.client.get(reverse('post_edit', args=['missing'])).status_code, 404)
+
+    def test_patch_writes_only_the_changed_columns(self):
+        etag = self.read_etag()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch({'summary': "edited", 'body': "<h1>Body</h1>", 'tags': ['python']}, etag)
+
+        self.assertEqual(response.status_code, 200)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "blog_post" SET')]
+        self.assertRegex(updates[0], r'^UPDATE "blog_post" SET "updated" = .*, "summary" = .* WHERE')
+        self.assertNotIn('"body" =', updates[0])
+        self.assertNotIn('"tag_names" =', ' '.join(updates))
+
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual((post.summary, post.tag_names), ("edited", ['python']))
+        self.assertEqual(PostEdit.objects.filter(post=post, edited_by=self.admin).count(), 1)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response['ETag'], self.read_etag())
+
+    def test_patch_requires_if_match(self):
+        response = self.client.patch(self.url, {'summary': "edited"}, format='json')
+
+        self.assertEqual(response.status_code, 428)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).summary, "summarized-1")
+
+    def test_concurrent_editors_do_not_overwrite_each_other(self):
+        etag = self.read_etag()
+
+        self.assertEqual(self.patch({'summary': "first"}, etag).status_code, 200)
+        response = self.patch({'summary': "second"}, etag)
+
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response['ETag'], self.read_etag())
+        self.assertEqual(Post.objects.get(pk=self.post.pk).summary, "first")
+        self.assertEqual(PostEdit.objects.count(), 1)
+
+    def test_weak_and_wildcard_validators(self):
+        etag = self.read_etag()
+
+        self.assertEqual(self.patch({'summary': "weak"}, f'W/{etag}').status_code, 412)
+        self.assertEqual(self.patch({'summary': "any"}, '*').status_code, 200)
+        self.assertEqual(self.patch({'summary': "listed"}, f'"other", {self.read_etag()}').status_code, 200)
+
+    def test_unchanged_values_write_nothing(self):
+        etag = self.read_etag()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.patch({'summary': "summarized-1", 'tags': ['python']}, etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries if query['sql'].startswith(('UPDATE', 'INSERT'))])
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(PostEdit.objects.exists())
+
+    def test_tag_changes_keep_the_etag_current(self):
+        response = self.patch({'tags': ['python', 'django']}, self.read_etag())
+
+        self.assertEqual(response.status_code, 200)
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(post.tag_names, ['django', 'python'])
+        self.assertEqual(TagStat.objects.get(tag__name='django').published_count, 1)
+        self.assertEqual(self.patch({'summary': "again"}, response['ETag']).status_code, 200)
+
+    def test_failed_audit_insert_rolls_the_update_back(self):
+        etag = self.read_etag()
+
+        with mock.patch.object(PostEdit.objects, 'create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.patch({'summary': "lost"}, etag)
+
+        self.assertEqual(Post.objects.get(pk=self.post.pk).summary, "summarized-1")
+
+    def test_put_checks_if_match_when_sent(self):
+        data = {'summary': "put", 'body': "<h1>Body</h1>", 'tags': ['python']}
+
+        self.assertEqual(self.client.put(self.url, data, format='json', HTTP_IF_MATCH='"stale"').status_code, 412)
+        self.assertEqual(self.client.put(self.url, data, format='json').status_code, 200)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).summary, "put")
+        self.assertEqual(self.client.put(reverse('post_edit', args=['missing']), data, format='json').status_code,
+                         404)
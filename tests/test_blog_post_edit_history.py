@@ -0,0 +1,133 @@
+import datetime
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post, PostEdit, Tags
+
+
+class BlogPostEditHistoryTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        self.editor = User.objects.create(username="editor", is_admin=True, email='editor@tell-all.com')
+        self.post = Post.objects.create(title="History-1", summary="summarized-1", body="<h1>Body</h1>",
+                                        author=self.admin)
+        self.post.tags.add(Tags.objects.create(name="python"))
+        Tags.objects.create(name="django")
+        self.other = Post.objects.create(title="History-2", summary="summarized-2", author=self.admin)
+
+    def patch(self, user, data, slug='history-1'):
+        self.client.force_authenticate(user=user)
+        url = reverse('post_edit', args=[slug])
+        response = self.client.patch(url, data, format='json', HTTP_IF_MATCH=self.client.get(url)['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_edits_record_only_the_changed_fields(self):
+        pub_date = datetime.date.today() + datetime.timedelta(days=3)
+        self.patch(self.admin, {'summary': "edited", 'body': "<h1>Body</h1>", 'pub_date': pub_date.isoformat(),
+                                'tags': ['python', 'django']})
+
+        self.assertEqual(PostEdit.objects.get().changes, {
+            'summary': ["summarized-1", "edited"],
+            'pub_date': [None, pub_date.isoformat()],
+            'tags': [['python'], ['django', 'python']],
+        })
+
+    def test_bulk_edits_record_their_changes(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.put(reverse('post_bulk_edit'), [
+            {'slug': 'history-1', 'summary': "bulk", 'tags': ['python']},
+            {'slug': 'history-2', 'summary': "summarized-2"},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        changes = dict(PostEdit.objects.values_list('post__slug', 'changes'))
+        self.assertEqual(changes, {'history-1': {'summary': ["summarized-1", "bulk"]}})
+
+    def test_post_history_newest_first(self):
+        for i in range(3):
+            self.patch(self.admin if i % 2 else self.editor, {'summary': f"edit-{i}"})
+        self.patch(self.admin, {'summary': "other"}, slug='history-2')
+        self.client.force_authenticate(user=self.admin)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('post_edit_history', args=['history-1']))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['message'], "Post edit history")
+        self.assertEqual([(edit['edited_by'], edit['changes']['summary'][1]) for edit in response.data['data']], [
+            ('editor@tell-all.com', "edit-2"), ('admin1@tell-all.com', "edit-1"), ('editor@tell-all.com', "edit-0"),
+        ])
+        self.assertIsNone(response.data['next'])
+
+    def test_history_pages_with_a_cursor(self):
+        for i in range(5):
+            self.patch(self.admin, {'summary': f"edit-{i}"})
+        self.client.force_authenticate(user=self.admin)
+
+        seen = []
+        url = f"{reverse('post_edit_history', args=['history-1'])}?limit=2"
+        while url:
+            response = self.client.get(url)
+            seen += [edit['changes']['summary'][1] for edit in response.data['data']]
+            url = response.data['next']
+
+        self.assertEqual(seen, [f"edit-{i}" for i in reversed(range(5))])
+
+    def test_history_of_missing_post(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('post_edit_history', args=['missing']))
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data, {"message": "post not found"})
+
+    def test_activity_feed_spans_posts(self):
+        self.patch(self.editor, {'summary': "first"})
+        self.patch(self.admin, {'summary': "second"}, slug='history-2')
+        self.client.force_authenticate(user=self.admin)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('post_edit_activity'))
+
+        self.assertEqual([(edit['post'], edit['edited_by']) for edit in response.data['data']],
+                         [('history-2', 'admin1@tell-all.com'), ('history-1', 'editor@tell-all.com')])
+
+    def test_admins_only(self):
+        self.client.force_authenticate(user=User.objects.create(username="reader", email='reader@tell-all.com'))
+        self.assertEqual(self.client.get(reverse('post_edit_activity')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('post_edit_history', args=['history-1'])).status_code, 403)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN output is PostgreSQL specific')
+class PostEditIndexUsageTests(APITestCase):
+    def setUp(self):
+        admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        posts = Post.objects.bulk_create([Post(title=f"Post-{i}", slug=f"post-{i}", author=admin)
+                                          for i in range(20)])
+        PostEdit.objects.bulk_create([PostEdit(post=post, edited_by=admin) for post in posts for _ in range(20)])
+        self.post = posts[3]
+
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+            cursor.execute('SET enable_bitmapscan = off')
+            cursor.execute('ANALYZE blog_postedit')
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = on')
+            cursor.execute('SET enable_bitmapscan = on')
+
+    def test_post_history_uses_post_created_index(self):
+        plan = PostEdit.objects.filter(post=self.post).order_by('-created', '-id')[:20].explain()
+        self.assertIn('blog_edit_post_created_idx', plan)
+        self.assertNotIn('Sort', plan)
+
+    def test_activity_feed_uses_created_index(self):
+        plan = PostEdit.objects.order_by('-created', '-id')[:20].explain()
+        self.assertIn('blog_edit_created_idx', plan)
+        self.assertNotIn('Sort', plan)
@@ -0,0 +1,67 @@
+import datetime
+import importlib
+
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from blog.models import Post, PublishRun
+from blog.publishing import publish_posts
+from blog.tasks import publish_freemium_posts, publish_scheduled_posts
+
+from .test_blog_publishing import create_due_posts
+
+task_metrics = importlib.import_module('ginger-edu-backend.task_metrics')
+
+
+class BlogPublishRunTests(TestCase):
+    def setUp(self):
+        self.authors = [User.objects.create(username=f"author-{i}", email=f'author-{i}@tell-all.com')
+                        for i in range(3)]
+
+    def test_run_is_summarized(self):
+        create_due_posts(25, self.authors)
+
+        publish_posts("freemium", chunk_size=10)
+
+        run = PublishRun.objects.get()
+        self.assertEqual((run.post_type, run.scheduled_only), ("freemium", False))
+        self.assertEqual((run.backlog, run.published, run.notified, run.chunks), (25, 25, 3, 3))
+        for seconds in (run.select_seconds, run.update_seconds, run.notify_seconds):
+            self.assertGreater(seconds, 0)
+        self.assertGreaterEqual(run.duration_seconds,
+                                run.select_seconds + run.update_seconds + run.notify_seconds)
+
+    def test_runs_with_nothing_due_are_not_stored(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(publish_posts("premium"), {"published": 0, "notified": 0})
+        self.assertFalse(PublishRun.objects.exists())
+
+    def test_tasks_log_duration_phases_and_rows(self):
+        create_due_posts(4, self.authors)
+
+        with self.assertLogs('ginger-edu-backend.celery', 'INFO') as logs:
+            publish_freemium_posts.apply()
+
+        delivery, publish = logs.output
+        self.assertRegex(delivery, r'Task deliver_notifications\[.+\] SUCCESS in [\d.]+s sent=3$')
+        self.assertRegex(publish, r'Task publish_freemium_posts\[.+\] SUCCESS in [\d.]+s '
+                                  r'select=[\d.]+s update=[\d.]+s notify=[\d.]+s '
+                                  r'backlog=4 published=4 notified=3$')
+
+    def test_task_rows_add_up_over_runs(self):
+        create_due_posts(2, self.authors, post_type="premium")
+        create_due_posts(3, self.authors)
+        Post.objects.update(publish_at=timezone.now() - datetime.timedelta(minutes=1))
+
+        with self.assertLogs('ginger-edu-backend.celery', 'INFO') as logs:
+            publish_scheduled_posts.apply()
+
+        # one task, one run per post type
+        self.assertRegex(logs.output[-1], r'backlog=5 published=5 notified=5$')
+        self.assertEqual(sorted(PublishRun.objects.values_list('post_type', 'published')),
+                         [("freemium", 3), ("premium", 2)])
+
+    def test_record_outside_tasks_does_nothing(self):
+        task_metrics.record({'select': 1.0}, published=1)
+        self.assertIsNone(task_metrics.finish('not-started'))
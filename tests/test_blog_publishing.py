@@ -0,0 +1,88 @@
+import datetime
+import threading
+import tracemalloc
+
+from django.core import mail
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from accounts.models import User
+from blog.models import Post
+from blog.publishing import publish_posts
+
+
+def create_due_posts(count, authors, post_type="freemium"):
+    Post.objects.bulk_create([
+        Post(title=f"{post_type}-{i}", slug=f"{post_type}-{i}", summary=f"summarized-{i}",
+             body="<h1>Body</h1>", cover_picture="cover-picture/test.png", type=post_type,
+             pub_date=datetime.date.today(), author=authors[i % len(authors)])
+        for i in range(count)
+    ])
+
+
+class BlogPublishingTests(TestCase):
+    def setUp(self):
+        self.authors = [User.objects.create(username=f"author-{i}", email=f'author-{i}@tell-all.com')
+                        for i in range(3)]
+
+    def test_publish_in_chunks_notifies_each_author_once(self):
+        create_due_posts(25, self.authors)
+        create_due_posts(5, self.authors, post_type="premium")
+
+        result = publish_posts("freemium", chunk_size=4)
+
+        self.assertEqual(result, {"published": 25, "notified": 3})
+        self.assertEqual(Post.published_objects.filter(type="freemium").count(), 25)
+        self.assertEqual(Post.draft_objects.filter(type="premium").count(), 5)
+        notified = [address for message in mail.outbox for address in message.to]
+        self.assertEqual(sorted(notified), sorted(author.email for author in self.authors))
+
+    def test_nothing_due_sends_nothing(self):
+        self.assertEqual(publish_posts("premium"), {"published": 0, "notified": 0})
+        self.assertEqual(mail.outbox, [])
+
+    def test_peak_memory_does_not_grow_with_backlog(self):
+        """
+        Benchmark: peak memory stays flat as the backlog grows tenfold
+        """
+        peaks = {}
+        for backlog in (200, 2000):
+            Post.objects.all().delete()
+            create_due_posts(backlog, self.authors)
+
+            tracemalloc.start()
+            publish_posts("freemium", chunk_size=100)
+            peaks[backlog] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            self.assertEqual(Post.published_objects.count(), backlog)
+
+        # loading the backlog as Post instances would cost well over 1KB a post
+        growth_per_post = (peaks[2000] - peaks[200]) / 1800
+        self.assertLess(growth_per_post, 100, peaks)
+
+
+class BlogConcurrentPublishingTests(TransactionTestCase):
+    def test_concurrent_workers_publish_each_post_once(self):
+        """
+        Ensure workers running side by side split the backlog without overlap
+        """
+        authors = [User.objects.create(username=f"author-{i}", email=f'author-{i}@tell-all.com')
+                   for i in range(5)]
+        create_due_posts(300, authors)
+        results = []
+
+        def worker():
+            try:
+                results.append(publish_posts("freemium", chunk_size=10))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(result["published"] for result in results), 300)
+        self.assertEqual(Post.published_objects.count(), 300)
@@ -0,0 +1,55 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post, Tags
+
+
+class BlogListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        tags = [Tags.objects.create(name=f"tag-{i}") for i in range(3)]
+        for i in range(30):
+            author = User.objects.create(username=f"author-{i}", email=f'author-{i}@tell-all.com')
+            post = Post.objects.create(title=f"Post-{i}", summary=f"summarized-{i}",
+                                       body="<h1>Body</h1>", status="published", author=author)
+            post.tags.set(tags[:i % 3 + 1])
+
+    def test_published_list_query_count_is_constant(self):
+        """
+        Ensure the published list issues the same number of queries for any page size
+        """
+        url = reverse('post_list_published')
+
+        for limit in (1, 5, 25):
+            # validators with the count, page of posts joined with authors, tags for the page
+            with self.assertNumQueries(3):
+                response = self.client.get(url, {'limit': limit})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data.get('data')), limit)
+
+    def test_all_post_list_query_count_is_constant(self):
+        """
+        Ensure the admin list issues the same number of queries for any page size
+        """
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('post_list_all')
+
+        for limit in (1, 5, 25):
+            with self.assertNumQueries(3):
+                response = self.client.get(url, {'limit': limit})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data.get('data')), limit)
+
+    def test_list_serializes_author_and_tags(self):
+        """
+        Ensure the prefetched author email and tag names are serialized
+        """
+        post = Post.objects.get(title="Post-2")
+        response = self.client.get(reverse('post_list_published'), {'limit': 30})
+        data = {row['slug']: row for row in response.data.get('data')}
+
+        self.assertEqual(data[post.slug]['author_email_address'], 'author-2@tell-all.com')
+        self.assertEqual(sorted(data[post.slug]['tags']), ['tag-0', 'tag-1', 'tag-2'])
@@ -0,0 +1,100 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post
+from blog.renditions import EXIF_ORIENTATION, rendition_names
+from blog.tasks import generate_cover_renditions
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def cover_upload(name, size=(2000, 1000), image_format='JPEG', mode='RGB', exif=None):
+    buffer = BytesIO()
+    image = Image.new(mode, size, 'red' if mode == 'RGB' else (255, 0, 0, 0))
+    image.save(buffer, image_format, **({'exif': exif} if exif else {}))
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BLOG_COVER_RENDITION_WIDTHS=(320, 640, 1280))
+class BlogCoverRenditionTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+
+    def create_post(self, cover):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(title="Covered", summary="summarized", body="<h1>Body</h1>",
+                                       status="published", cover_picture=cover, author=self.admin)
+        return Post.objects.get(pk=post.pk)
+
+    def test_upload_generates_renditions(self):
+        post = self.create_post(cover_upload('cover.jpg'))
+
+        cover_renditions = post.cover_renditions
+        self.assertEqual(cover_renditions['source'], post.cover_picture.name)
+        self.assertEqual((cover_renditions['width'], cover_renditions['height']), (1280, 640))
+        self.assertTrue(cover_renditions['placeholder'].startswith('data:image/jpeg;base64,'))
+        for extension in ('webp', 'jpeg'):
+            renditions = cover_renditions['renditions'][extension]
+            self.assertEqual([(r['width'], r['height']) for r in renditions], [(320, 160), (640, 320), (1280, 640)])
+            for rendition in renditions:
+                self.assertTrue(rendition['name'].endswith(f"-{rendition['width']}w.{extension}"))
+                self.assertEqual(default_storage.size(rendition['name']), rendition['size'])
+                with default_storage.open(rendition['name']) as file, Image.open(file) as image:
+                    self.assertEqual(image.size, (rendition['width'], rendition['height']))
+
+    def test_small_covers_are_not_upscaled(self):
+        post = self.create_post(cover_upload('small.png', size=(400, 300), image_format='PNG', mode='RGBA'))
+
+        self.assertEqual([r['width'] for r in post.cover_renditions['renditions']['jpeg']], [320, 400])
+
+    def test_exif_orientation_is_applied(self):
+        exif = Image.Exif()
+        exif[EXIF_ORIENTATION] = 6
+        post = self.create_post(cover_upload('rotated.jpg', size=(1000, 2000), exif=exif))
+
+        self.assertEqual((post.cover_renditions['width'], post.cover_renditions['height']), (1280, 640))
+
+    def test_replacing_the_cover_removes_old_renditions(self):
+        post = self.create_post(cover_upload('first.jpg'))
+        old_names = rendition_names(post.cover_renditions)
+
+        post.cover_picture = cover_upload('second.jpg', size=(800, 400))
+        with self.captureOnCommitCallbacks(execute=True):
+            post.save()
+
+        post.refresh_from_db()
+        self.assertIn('second', post.cover_renditions['source'])
+        self.assertFalse(any(default_storage.exists(name) for name in old_names))
+
+    @override_settings(BLOG_COVER_MAX_PIXELS=1000)
+    def test_oversized_cover_is_skipped(self):
+        post = self.create_post(cover_upload('huge.jpg'))
+
+        self.assertEqual(post.cover_renditions, {})
+        self.assertIsNone(generate_cover_renditions(post.pk))
+
+    def test_list_exposes_srcset(self):
+        self.create_post(cover_upload('listed.jpg'))
+        Post.objects.create(title="Bare", status="published", author=self.admin)
+
+        data = {row['slug']: row for row in self.client.get(reverse('post_list_published')).data['data']}
+
+        self.assertIsNone(data['bare']['cover_srcset'])
+        srcset = data['covered']['cover_srcset']
+        self.assertTrue(srcset['placeholder'].startswith('data:image/jpeg'))
+        self.assertEqual([entry.split(' ')[1] for entry in srcset['webp'].split(', ')], ['320w', '640w', '1280w'])
+        self.assertTrue(srcset['jpeg'].startswith('http://testserver/'))
@@ -0,0 +1,82 @@
+import datetime
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post
+from blog.tasks import publish_premium_posts, publish_scheduled_posts
+
+
+class BlogScheduledPublishingTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        now = timezone.now()
+        for i, (post_type, publish_at) in enumerate([
+            ("premium", now - datetime.timedelta(minutes=1)),
+            ("freemium", now - datetime.timedelta(minutes=5)),
+            ("premium", now + datetime.timedelta(hours=2)),
+        ]):
+            Post.objects.create(title=f"Scheduled-{i}", summary=f"summarized-{i}",
+                                body="<h1>Body</h1>", cover_picture="cover-picture/scheduled.png",
+                                type=post_type, publish_at=publish_at,
+                                pub_date=timezone.localdate(publish_at), author=self.admin)
+
+    def test_sweep_publishes_only_due_posts(self):
+        result = publish_scheduled_posts()
+
+        self.assertEqual(result["premium"]["published"], 1)
+        self.assertEqual(result["freemium"]["published"], 1)
+        self.assertEqual(sorted(Post.published_objects.values_list('slug', flat=True)),
+                         ['scheduled-0', 'scheduled-1'])
+        self.assertEqual(Post.draft_objects.get().slug, 'scheduled-2')
+
+    def test_daily_sweep_keeps_type_separation(self):
+        """
+        Ensure the premium sweep also catches overdue scheduled premium posts only
+        """
+        publish_premium_posts()
+
+        self.assertEqual(list(Post.published_objects.values_list('slug', flat=True)), ['scheduled-0'])
+
+    def test_daily_sweep_skips_rescheduled_posts(self):
+        """
+        Ensure a post moved to a later time today is not published early by the daily sweep
+        """
+        Post.objects.filter(slug='scheduled-2').update(pub_date=datetime.date.today())
+
+        publish_premium_posts()
+
+        self.assertFalse(Post.published_objects.filter(slug='scheduled-2').exists())
+
+    def test_edit_reschedules_post(self):
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('post_edit', kwargs={'slug': 'scheduled-0'})
+        publish_at = timezone.now() + datetime.timedelta(days=3, hours=1)
+
+        response = self.client.put(url, {'publish_at': publish_at.isoformat()})
+        self.assertEqual(response.status_code, 200)
+
+        post = Post.objects.get(slug='scheduled-0')
+        self.assertEqual(post.publish_at, publish_at)
+        self.assertEqual(post.pub_date, timezone.localdate(publish_at))
+        publish_scheduled_posts()
+        self.assertEqual(Post.objects.get(slug='scheduled-0').status, 'draft')
+
+        # a bare pub_date hands the post back to the daily sweep
+        pub_date = datetime.date.today() + datetime.timedelta(days=5)
+        response = self.client.put(url, {'pub_date': pub_date.isoformat()})
+        self.assertEqual(response.status_code, 200)
+
+        post = Post.objects.get(slug='scheduled-0')
+        self.assertIsNone(post.publish_at)
+        self.assertEqual(post.pub_date, pub_date)
+
+    def test_publish_at_must_be_in_the_future(self):
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('post_edit', kwargs={'slug': 'scheduled-2'})
+
+        response = self.client.put(url, {'publish_at': (timezone.now() - datetime.timedelta(hours=1)).isoformat()})
+
+        self.assertEqual(response.status_code, 400)
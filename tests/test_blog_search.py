@@ -0,0 +1,58 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post, Tags
+
+
+class BlogSearchTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        self.tag = Tags.objects.create(name="gardening")
+        Post.objects.create(title="Growing tomatoes", summary="A summer guide",
+                            body="<p>Water daily.</p>", status="published", author=self.admin)
+        Post.objects.create(title="Kitchen notes", summary="Weeknight dinners",
+                            body="<p>Roast the tomatoes with garlic.</p>", status="published",
+                            author=self.admin)
+        Post.objects.create(title="Unreleased tomatoes", summary="Draft",
+                            body="<p>Not yet.</p>", author=self.admin)
+
+    def search(self, text):
+        response = self.client.get(reverse('post_search'), {'q': text})
+        self.assertEqual(response.status_code, 200)
+        return [row['slug'] for row in response.data.get('data')]
+
+    def test_search_ranks_title_matches_first(self):
+        """
+        Ensure published posts are matched on title and body, title hits ranking higher
+        """
+        self.assertEqual(self.search('tomato'), ['growing-tomatoes', 'kitchen-notes'])
+
+    def test_search_covers_summary(self):
+        self.assertEqual(self.search('dinner'), ['kitchen-notes'])
+
+    def test_search_vector_follows_edits_and_tags(self):
+        """
+        Ensure the stored vector is refreshed on save and on tag changes
+        """
+        post = Post.objects.get(slug='kitchen-notes')
+        self.assertEqual(self.search('gardening'), [])
+
+        post.tags.add(self.tag)
+        self.assertEqual(self.search('gardening'), ['kitchen-notes'])
+
+        self.tag.name = 'horticulture'
+        self.tag.save()
+        self.assertEqual(self.search('horticulture'), ['kitchen-notes'])
+
+        post.tags.clear()
+        self.assertEqual(self.search('horticulture'), [])
+
+        post.summary = 'Bread baking'
+        post.save()
+        self.assertEqual(self.search('bread'), ['kitchen-notes'])
+        self.assertEqual(self.search('dinner'), [])
+
+    def test_search_requires_query(self):
+        response = self.client.get(reverse('post_search'))
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,137 @@
+import datetime
+
+from django.db import connection
+from django.db.models import Count, Q
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from blog.models import Post, Tags
+from blog.publishing import publish_posts
+
+
+class BlogTagTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        self.python = Tags.objects.create(name="python")
+        self.django = Tags.objects.create(name="django")
+        self.celery = Tags.objects.create(name="celery")
+        self.posts = []
+        for i in range(4):
+            post = Post.objects.create(title=f"Post-{i}", summary=f"summarized-{i}",
+                                       body="<h1>Body</h1>", cover_picture="cover-picture/post.png",
+                                       type="premium", pub_date=datetime.date.today(), author=self.admin)
+            post.tags.set([self.python, self.django] if i < 3 else [self.celery])
+            self.posts.append(post)
+
+    def tag_cloud(self):
+        response = self.client.get(reverse('tag_list'))
+        self.assertEqual(response.status_code, 200)
+        return {row['name']: row['count'] for row in response.data['data']}
+
+    def assertCountsMatchPosts(self):
+        expected = Tags.objects.annotate(published=Count('post', filter=Q(post__status='published')))
+        self.assertEqual(self.tag_cloud(), {tag.name: tag.published for tag in expected if tag.published})
+
+    def test_tag_names_follow_tag_changes(self):
+        post = self.posts[0]
+        self.assertEqual(Post.objects.get(pk=post.pk).tag_names, ['django', 'python'])
+
+        post.tags.remove(self.python)
+        self.celery.post_set.add(post)
+        self.assertEqual(Post.objects.get(pk=post.pk).tag_names, ['celery', 'django'])
+
+        self.django.name = "djangorestframework"
+        self.django.save()
+        self.assertEqual(Post.objects.get(pk=post.pk).tag_names, ['celery', 'djangorestframework'])
+
+        self.celery.delete()
+        post.tags.clear()
+        self.assertEqual(Post.objects.get(pk=post.pk).tag_names, [])
+
+    def test_tag_filter_lists_each_post_once(self):
+        Post.objects.update(status="published")
+        response = self.client.get(reverse('post_list_published'), {'tags__name': 'python'})
+
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(sorted(row['slug'] for row in response.data['data']), ['post-0', 'post-1', 'post-2'])
+
+    def test_publishing_counts_tags(self):
+        self.assertEqual(self.tag_cloud(), {})
+
+        publish_posts("premium")
+
+        self.assertEqual(self.tag_cloud(), {'python': 3, 'django': 3, 'celery': 1})
+
+    def test_counts_follow_published_posts(self):
+        publish_posts("premium")
+        first, second = Post.objects.get(pk=self.posts[0].pk), Post.objects.get(pk=self.posts[1].pk)
+
+        first.tags.remove(self.python, self.celery)
+        first.tags.add(self.celery)
+        self.python.post_set.add(self.posts[3])
+        self.django.post_set.remove(second, self.posts[3])
+        self.assertCountsMatchPosts()
+
+        second.status = "draft"
+        second.save()
+        self.assertCountsMatchPosts()
+
+        first.delete()
+        self.celery.post_set.clear()
+        self.assertCountsMatchPosts()
+
+    def test_status_saves_do_not_look_the_stored_status_up(self):
+        post = Post.objects.get(pk=self.posts[0].pk)
+        post.status = "published"
+
+        with CaptureQueriesContext(connection) as queries:
+            post.save()
+        self.assertFalse([query for query in queries if query['sql'].startswith('SELECT (1)')])
+        self.assertCountsMatchPosts()
+
+        other = Post.objects.get(pk=post.pk)
+        post.status = "draft"
+        post.save()
+        other.refresh_from_db()
+        other.status = "published"
+        other.save()
+        self.assertCountsMatchPosts()
+
+        deferred = Post.objects.defer('status').get(pk=post.pk)
+        deferred.status = "draft"
+        deferred.save()
+        self.assertCountsMatchPosts()
+
+    def test_bulk_edit_moves_counts(self):
+        publish_posts("premium")
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.put(reverse('post_bulk_edit'), [
+            {'slug': 'post-0', 'tags': ['celery']},
+            {'slug': 'post-3', 'tags': ['python', 'celery']},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Post.objects.get(slug='post-0').tag_names, ['celery'])
+        self.assertEqual(Post.objects.get(slug='post-3').tag_names, ['celery', 'python'])
+        self.assertCountsMatchPosts()
+
+    def test_bulk_create_stores_sorted_tag_names(self):
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(reverse('post_bulk_add'), [
+            {'title': "Bulk-1", 'tags': ['python', 'celery', 'django']},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Post.objects.get(slug='bulk-1').tag_names, ['celery', 'django', 'python'])
+
+    def test_tag_cloud_is_one_query(self):
+        publish_posts("premium")
+
+        with self.assertNumQueries(1):
+            data = self.client.get(reverse('tag_list')).data['data']
+
+        self.assertEqual(data[0], {'name': 'django', 'count': 3})
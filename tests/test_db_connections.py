@@ -0,0 +1,131 @@
+import importlib
+import os
+import re
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+import psycopg2
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from blog.models import Post
+
+celery = importlib.import_module('ginger-edu-backend.celery')
+db_connections = importlib.import_module('ginger-edu-backend.db_connections')
+
+
+@skipUnless(connection.vendor == 'postgresql', 'terminates PostgreSQL backends')
+class DatabaseConnectionTests(TransactionTestCase):
+    def setUp(self):
+        self.addCleanup(connection.close)
+
+    def backend_pid(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_backend_pid()')
+            return cursor.fetchone()[0]
+
+    def terminate(self, pid):
+        other = psycopg2.connect(**connection.get_connection_params())
+        try:
+            with other.cursor() as cursor:
+                cursor.execute('SELECT pg_terminate_backend(%s)', [pid])
+        finally:
+            other.close()
+
+    def backend_alive(self, pid):
+        other = psycopg2.connect(**connection.get_connection_params())
+        try:
+            with other.cursor() as cursor:
+                cursor.execute('SELECT count(*) FROM pg_stat_activity WHERE pid = %s', [pid])
+                return cursor.fetchone()[0] == 1
+        finally:
+            other.close()
+
+    def test_health_check_replaces_a_dead_connection(self):
+        self.terminate(self.backend_pid())
+        with self.assertRaises(OperationalError):
+            Post.objects.count()
+        connection.close()
+
+        pid = self.backend_pid()
+        self.terminate(pid)
+        db_connections.expire_health_checks()
+        self.assertEqual(Post.objects.count(), 0)
+        self.assertNotEqual(self.backend_pid(), pid)
+
+        # atomic() is checked as it starts the transaction
+        self.terminate(self.backend_pid())
+        db_connections.expire_health_checks()
+        with transaction.atomic():
+            self.assertEqual(Post.objects.count(), 0)
+
+    def test_connections_are_checked_once_per_request_that_queries(self):
+        url = reverse('post_list_published')
+        self.client.get(url)
+
+        with mock.patch.object(type(connections['default']), 'is_usable', autospec=True, return_value=True) as is_usable:
+            with self.assertNumQueries(0):
+                # served from the cache
+                self.client.get(url)
+            self.assertEqual(is_usable.call_count, 0)
+
+            self.client.get(url, {'limit': 2})
+            self.assertEqual(is_usable.call_count, 1)
+
+    def test_requests_survive_a_dead_connection(self):
+        self.terminate(self.backend_pid())
+
+        self.assertEqual(self.client.get(reverse('post_list_published')).status_code, 200)
+
+    def test_forked_child_leaves_the_parent_connection_alive(self):
+        pid = self.backend_pid()
+
+        child = os.fork()
+        if child == 0:
+            try:
+                celery.close_inherited_db_connections()
+            finally:
+                os._exit(0)
+        os.waitpid(child, 0)
+
+        self.assertTrue(self.backend_alive(pid))
+        self.assertEqual(self.backend_pid(), pid)
+
+    def test_task_hooks_recycle_connections(self):
+        task = SimpleNamespace(request=SimpleNamespace(is_eager=False))
+        self.terminate(self.backend_pid())
+        celery.prepare_db_connections(task=task)
+        self.assertEqual(Post.objects.count(), 0)
+
+        pid = self.backend_pid()
+        max_age = connection.settings_dict['CONN_MAX_AGE']
+        connection.settings_dict['CONN_MAX_AGE'] = 0
+        self.addCleanup(connection.settings_dict.__setitem__, 'CONN_MAX_AGE', max_age)
+        # eager tasks share the caller's connection, which must stay open
+        celery.release_db_connections(task=SimpleNamespace(request=SimpleNamespace(is_eager=True)))
+        self.assertEqual(self.backend_pid(), pid)
+
+        connection.close_at = 0
+        celery.release_db_connections(task=task)
+        self.assertIsNone(connection.connection)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_db_connections', requests=5, stdout=out)
+
+        self.assertEqual(len(re.findall(r'mean [\d.]+ ms, p50 [\d.]+ ms, p95 [\d.]+ ms', out.getvalue())), 3,
+                         out.getvalue())
+
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), 'timings depend on the machine, set RUN_BENCHMARKS to run')
+    def test_connection_benchmark(self):
+        """
+        Benchmark: per request latency with and without persistent connections
+        """
+        out = StringIO()
+        call_command('benchmark_db_connections', requests=30, stdout=out)
+
+        means = [float(mean) for mean in re.findall(r'mean ([\d.]+) ms', out.getvalue())]
+        self.assertLess(means[1], means[0], out.getvalue())
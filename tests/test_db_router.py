@@ -0,0 +1,144 @@
+import datetime
+import importlib
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from blog.cache import POSTS_RECENT_WRITE_KEY
+from blog.models import Post
+from blog.publishing import publish_posts
+
+db_router = importlib.import_module('ginger-edu-backend.db_router')
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0', 'replica_1'], DATABASE_READ_YOUR_WRITES_SECONDS=5)
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = db_router.PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def read_db(self, request, status=200, user=None):
+        seen = []
+
+        def view(request):
+            seen.extend(self.router.db_for_read(Post) for _ in range(20))
+            return HttpResponse(status=status)
+
+        request.user = user or AnonymousUser()
+        db_router.ReplicaReadMiddleware(view)(request)
+        # every read of a request goes to the same database
+        self.assertEqual(len(set(seen)), 1, seen)
+        return seen[0]
+
+    def test_reads_outside_requests_use_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+        with db_router.replica_reads():
+            self.assertIn(self.router.db_for_read(Post), ['replica_0', 'replica_1'])
+            self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_safe_requests_read_from_replicas(self):
+        self.assertIn(self.read_db(self.factory.get('/blog/posts')), ['replica_0', 'replica_1'])
+        self.assertEqual(self.read_db(self.factory.post('/blog/posts/add')), 'default')
+
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        token = {'HTTP_AUTHORIZATION': 'Token abc'}
+        self.read_db(self.factory.put('/blog/posts/edit/post', **token), user=User(username="admin"))
+
+        self.assertEqual(self.read_db(self.factory.get('/blog/posts', **token)), 'default')
+        # other clients keep reading from the replicas
+        self.assertIn(self.read_db(self.factory.get('/blog/posts', HTTP_AUTHORIZATION='Token xyz')),
+                      ['replica_0', 'replica_1'])
+
+        cache.delete(db_router.pin_key(self.factory.get('/', **token)))
+        self.assertIn(self.read_db(self.factory.get('/blog/posts', **token)), ['replica_0', 'replica_1'])
+
+    def test_failed_and_anonymous_writes_do_not_pin(self):
+        token = {'HTTP_AUTHORIZATION': 'Token abc'}
+        for status in (401, 403, 404, 405):
+            self.read_db(self.factory.put('/blog/posts/edit/post', **token), status=status,
+                         user=User(username="admin"))
+        self.read_db(self.factory.put('/blog/posts/edit/post', **token))
+        self.assertIn(self.read_db(self.factory.get('/blog/posts', **token)), ['replica_0', 'replica_1'])
+
+        # anonymous clients behind one address are never pinned
+        self.read_db(self.factory.post('/api-token-auth'))
+        self.assertIn(self.read_db(self.factory.get('/blog/posts')), ['replica_0', 'replica_1'])
+
+    def test_session_clients_are_pinned_by_their_session(self):
+        self.factory.cookies[settings.SESSION_COOKIE_NAME] = 'session-1'
+        self.read_db(self.factory.post('/blog/posts/add'), status=201, user=User(username="admin"))
+
+        self.assertEqual(self.read_db(self.factory.get('/blog/posts')), 'default')
+        self.factory.cookies[settings.SESSION_COOKIE_NAME] = 'session-2'
+        self.assertIn(self.read_db(self.factory.get('/blog/posts')), ['replica_0', 'replica_1'])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_the_primary(self):
+        self.assertEqual(self.read_db(self.factory.get('/blog/posts')), 'default')
+
+    def test_migrations_only_run_on_the_primary(self):
+        self.assertTrue(self.router.allow_migrate('default', 'blog'))
+        self.assertFalse(self.router.allow_migrate('replica_0', 'blog'))
+
+
+@skipUnless(settings.DATABASE_REPLICAS, 'set DB_REPLICA_HOSTS to run against a replica alias')
+class ReplicaRoutingIntegrationTests(TransactionTestCase):
+    """
+    Run with DB_REPLICA_HOSTS pointing at the primary's own host to get a
+    second alias on the same database.
+    """
+    databases = {'default', *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        for i in range(3):
+            Post.objects.create(title=f"Post-{i}", summary="summarized", body="<h1>Body</h1>", type="premium",
+                                status="published" if i else "draft", pub_date=datetime.date.today(),
+                                author=self.admin)
+        Post.objects.update(cover_picture="cover-picture/post.png")
+        cache.clear()
+        self.client = APIClient()
+
+    def captured(self, alias, func):
+        with CaptureQueriesContext(connections[alias]) as queries:
+            func()
+        return len(queries)
+
+    def test_lists_read_from_a_replica_until_the_client_writes(self):
+        replica = settings.DATABASE_REPLICAS[0]
+        with override_settings(DATABASE_REPLICAS=[replica]):
+            self.assertGreater(self.captured(replica, lambda: self.client.get(reverse('post_list_published'))), 0)
+
+            self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.admin).key}')
+            response = self.client.delete(reverse('post_delete', kwargs={'slug': 'post-2'}))
+            self.assertEqual(response.status_code, 204)
+            self.assertTrue(cache.get(POSTS_RECENT_WRITE_KEY))
+
+            reads = self.captured(replica, lambda: self.client.get(reverse('post_list_published')))
+            self.assertEqual(reads, 0)
+
+            # tasks are not requests, their reads and writes stay on the primary
+            self.assertEqual(self.captured(replica, lambda: publish_posts("premium")), 0)
+            self.assertEqual(Post.published_objects.count(), 2)
+
+    def test_edit_reads_come_from_the_primary(self):
+        replica = settings.DATABASE_REPLICAS[0]
+        self.client.force_authenticate(user=self.admin)
+        with override_settings(DATABASE_REPLICAS=[replica]):
+            # the ETag is sent back with If-Match
+            reads = self.captured(replica, lambda: self.client.get(reverse('post_edit', args=['post-1'])))
+        self.assertEqual(reads, 0)
@@ -0,0 +1,160 @@
+import importlib
+import os
+import re
+import time
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from blog.models import Post
+
+metrics = importlib.import_module('ginger-edu-backend.metrics')
+
+
+def sample(name, **labels):
+    """
+    Current value of one series in the metrics text, 0 when absent.
+    """
+    selector = ','.join(f'{label}="{value}"' for label, value in labels.items())
+    match = re.search(rf'^{re.escape(name)}{{{re.escape(selector)}}} (\S+)$', metrics.render_metrics(), re.M)
+    return float(match.group(1)) if match else 0
+
+
+class HistogramTests(TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = metrics.Histogram('test_seconds', "Test.", ('view',), (0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(('a',), value)
+
+        self.assertEqual(histogram.collect(), [
+            '# HELP test_seconds Test.',
+            '# TYPE test_seconds histogram',
+            'test_seconds_bucket{view="a",le="0.1"} 2',
+            'test_seconds_bucket{view="a",le="1"} 3',
+            'test_seconds_bucket{view="a",le="+Inf"} 4',
+            'test_seconds_sum{view="a"} 3.65',
+            'test_seconds_count{view="a"} 4',
+        ])
+
+    def test_label_values_are_escaped(self):
+        counter = metrics.Counter('test_total', "Test.", ('view',))
+        counter.inc(('say "hi"\\\n',))
+        self.assertEqual(counter.collect()[-1], r'test_total{view="say \"hi\"\\\n"} 1')
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        for i in range(3):
+            Post.objects.create(title=f"Post-{i}", summary=f"summarized-{i}", body="<h1>Body</h1>",
+                                status="published", author=admin)
+
+    def test_records_time_queries_and_size_per_view(self):
+        labels = {'view': 'post_detail', 'method': 'GET'}
+        before = {name: sample(name, **labels) for name in (
+            'http_request_duration_seconds_count', 'http_request_db_queries_sum',
+            'http_request_db_duration_seconds_count', 'http_response_size_bytes_sum')}
+        responses = sample('http_responses_total', **labels, status=200)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('post_detail', args=['post-1']))
+
+        self.assertEqual(sample('http_request_duration_seconds_count', **labels),
+                         before['http_request_duration_seconds_count'] + 1)
+        self.assertEqual(sample('http_request_db_queries_sum', **labels), before['http_request_db_queries_sum'] + 2)
+        self.assertEqual(sample('http_request_db_duration_seconds_count', **labels),
+                         before['http_request_db_duration_seconds_count'] + 1)
+        self.assertEqual(sample('http_response_size_bytes_sum', **labels),
+                         before['http_response_size_bytes_sum'] + len(response.content))
+        self.assertEqual(sample('http_responses_total', **labels, status=200), responses + 1)
+
+    def test_unresolved_paths_and_unknown_methods_share_labels(self):
+        unmatched = sample('http_responses_total', view='unmatched', method='GET', status=404)
+        other = sample('http_responses_total', view='post_list_published', method='other', status=405)
+
+        self.client.get('/blog/no-such-page')
+        self.client.generic('BREW', reverse('post_list_published'))
+
+        self.assertEqual(sample('http_responses_total', view='unmatched', method='GET', status=404), unmatched + 1)
+        self.assertEqual(sample('http_responses_total', view='post_list_published', method='other', status=405),
+                         other + 1)
+
+    @override_settings(METRICS_SLOW_REQUEST_SECONDS=0)
+    def test_slow_requests_log_their_statements(self):
+        with self.assertLogs('ginger-edu-backend.metrics', 'WARNING') as logs:
+            self.client.get(reverse('post_detail', args=['post-1']))
+
+        self.assertIn('Slow request GET /blog/posts/detail/post-1 (post_detail)', logs.output[0])
+        self.assertIn('1x', logs.output[0])
+        self.assertIn('FROM "blog_post"', logs.output[0])
+
+    def test_queries_outside_requests_are_not_collected(self):
+        before = metrics.render_metrics()
+        Post.objects.count()
+        self.assertEqual(metrics.render_metrics(), before)
+
+    @override_settings(METRICS_PUBLIC=True)
+    def test_metrics_endpoint(self):
+        self.client.get(reverse('post_list_published'))
+
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn('# TYPE http_request_duration_seconds histogram', response.content.decode())
+        self.assertIn('http_request_db_queries_bucket{view="post_list_published",method="GET",le="+Inf"}',
+                      response.content.decode())
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_metrics_endpoint_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+
+    @override_settings(METRICS_TOKEN=None, METRICS_PUBLIC=False)
+    def test_metrics_endpoint_is_closed_by_default(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), 'timings depend on the machine, set RUN_BENCHMARKS to run')
+    def test_overhead(self):
+        """
+        Benchmark: cached list requests with and without the middleware
+        """
+        url = reverse('post_list_published')
+
+        def timed(requests):
+            started = time.perf_counter()
+            for _ in range(requests):
+                self.client.get(url)
+            return time.perf_counter() - started
+
+        # alternate the two so load from elsewhere hits both alike
+        instrumented, bare = [], []
+        for _ in range(7):
+            instrumented.append(timed(100))
+            with modify_settings(MIDDLEWARE={'remove': 'ginger-edu-backend.metrics.RequestMetricsMiddleware'}):
+                bare.append(timed(100))
+        instrumented, bare = min(instrumented), min(bare)
+
+        self.assertLess(instrumented, bare * 1.25, f'with {instrumented:.3f}s, without {bare:.3f}s')
+
+
+class AsyncRequestMetricsTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        max_age = connection.settings_dict['CONN_MAX_AGE']
+        connection.settings_dict['CONN_MAX_AGE'] = 0
+        self.addCleanup(connection.settings_dict.__setitem__, 'CONN_MAX_AGE', max_age)
+
+    def test_counts_queries_of_worker_threads(self):
+        labels = {'view': 'post_list_published_async', 'method': 'GET'}
+        queries = sample('http_request_db_queries_sum', **labels)
+
+        self.assertEqual(self.client.get(reverse('post_list_published_async')).status_code, 200)
+
+        self.assertGreater(sample('http_request_db_queries_sum', **labels), queries)
@@ -0,0 +1,112 @@
+import datetime
+import importlib
+import os
+import time
+import uuid
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from accounts.models import User
+from blog.models import Post, Tags
+
+renderers = importlib.import_module('ginger-edu-backend.renderers')
+FastJSONRenderer = renderers.FastJSONRenderer
+
+PAYLOAD = ReturnDict({
+    'message': gettext_lazy('post created'),
+    'created': datetime.datetime(2022, 12, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    'naive': datetime.datetime(2022, 12, 1, 10, 30),
+    'pub_date': datetime.date(2022, 12, 24),
+    'at': datetime.time(8, 15, 30, 250000),
+    'price': Decimal('10.50'),
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'text': 'café \u2028 line \u2029 "quoted" \\ \U0001f600',
+    'data': ReturnList([{'tags': ('python', 'django'), 'count': 3, 'ratio': 0.25, 'draft': None}], serializer=None),
+    1: True,
+}, serializer=None)
+
+
+def page_payload(size):
+    return {'message': 'All published post list', 'count': size, 'next': None, 'previous': None,
+            'data': [{'title': f'Post-{i}', 'slug': f'post-{i}', 'summary': 'summarized ' * 20,
+                      'cover_picture': f'http://testserver/cover-picture/post-{i}.png', 'cover_srcset': None,
+                      'author_email_address': 'admin1@tell-all.com', 'status': 'published',
+                      'type': 'freemium', 'tags': ['python', 'django']} for i in range(size)]}
+
+
+class FastJSONRendererTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", is_admin=True, email='admin1@tell-all.com')
+        python = Tags.objects.create(name="python")
+        for i in range(3):
+            post = Post.objects.create(title=f"Post-{i} café", summary=f"summarized-{i}",
+                                       body="<h1>Body</h1>", author=self.admin, status="published",
+                                       cover_picture=f"cover-picture/post-{i}.png",
+                                       pub_date=datetime.date(2022, 12, i + 1))
+            post.tags.set([python])
+        Post.objects.filter(slug='post-0-cafe').update(publish_at=timezone.now())
+
+    def assertSameAsJSONRenderer(self, response):
+        self.assertEqual(response.content, JSONRenderer().render(response.data), response.data)
+
+    def test_is_the_default_renderer(self):
+        self.assertIs(api_settings.DEFAULT_RENDERER_CLASSES[0], FastJSONRenderer)
+
+    @skipUnless(renderers.orjson, 'orjson is not installed')
+    def test_matches_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_indented_output_uses_the_stdlib_encoder(self):
+        rendered = FastJSONRenderer().render(PAYLOAD, 'application/json; indent=4')
+        self.assertEqual(rendered, JSONRenderer().render(PAYLOAD, 'application/json; indent=4'))
+
+    def test_blog_endpoints_match_json_renderer(self):
+        self.assertSameAsJSONRenderer(self.client.get(reverse('post_list_published')))
+        self.assertSameAsJSONRenderer(self.client.get(reverse('post_search'), {'q': 'summarized'}))
+        self.assertSameAsJSONRenderer(self.client.get(reverse('post_search')))
+        self.assertSameAsJSONRenderer(self.client.get(reverse('tag_list')))
+
+        self.client.force_authenticate(user=self.admin)
+        self.assertSameAsJSONRenderer(self.client.get(reverse('post_list_all'), {'pagination': 'cursor'}))
+        self.assertSameAsJSONRenderer(self.client.get(reverse('post_list_cache_stats')))
+        self.assertSameAsJSONRenderer(self.client.post(reverse('post_bulk_add'), [
+            {'title': 'Bulk', 'pub_date': '2000-01-01', 'tags': ['missing']},
+        ], format='json'))
+        self.assertSameAsJSONRenderer(self.client.post(reverse('post_bulk_add'), [
+            {'title': 'Bulk é', 'publish_at': (timezone.now() + datetime.timedelta(days=1)).isoformat()},
+        ], format='json'))
+
+    @skipUnless(renderers.orjson, 'orjson is not installed')
+    def test_large_page_matches_json_renderer(self):
+        data = page_payload(1000)
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    @skipUnless(renderers.orjson, 'orjson is not installed')
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), 'timings depend on the machine, set RUN_BENCHMARKS to run')
+    def test_render_throughput(self):
+        """
+        Benchmark: rendering a 1000 post page
+        """
+        data = page_payload(1000)
+
+        timings = []
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            started = time.perf_counter()
+            for _ in range(10):
+                renderer.render(data)
+            timings.append(time.perf_counter() - started)
+
+        self.assertLess(timings[1], timings[0], f'json {timings[0]:.3f}s, orjson {timings[1]:.3f}s')